@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Audio service that opens the mixer off the main thread
+
+Opening the audio device can block for hundreds of milliseconds while
+PulseAudio/ALSA are probed, so the variants initialize only display and
+font up front and let AudioService open the mixer and load the effects on
+a background thread.  The game holds SoundProxy objects from the start;
+their play() is a non-blocking no-op until the real Sound is swapped in,
+so the first frames simply render silently.
+
+Once open, every effect gets its own reserved channel: a new jump cuts off
+the previous jump instead of waiting for (or stealing) a free channel, and
+repeated triggers of one effect within a frame play only once.  One more
+reserved channel is kept for the streaming music (see music.py).
+"""
+import threading
+import time
+
+import pygame
+
+import sound_cache
+import sound_synth
+
+BUFFER_SIZE = 512  # Mixer buffer in samples; smaller means less latency
+FREQUENCY = 44100
+LATENCY_WINDOW = 1000  # Recent triggers kept for latency statistics
+
+
+def init_pygame():
+    """Initialize the pygame modules the games use, leaving out the mixer"""
+    # pygame.init() would also open the audio device on this thread
+    pygame.display.init()
+    pygame.font.init()
+
+
+class SoundProxy:
+    """Stands in for a pygame Sound until the audio service has loaded it"""
+
+    def __init__(self, name, service):
+        self.name = name
+        self.service = service
+        self.sound = None
+        self.channel = None  # Reserved channel, set before the sound is swapped in
+        self.played_frame = -1
+
+    def play(self):
+        sound = self.sound  # Single read: the loader thread may swap it in at any time
+        if sound is None:
+            return None
+        service = self.service
+        if self.played_frame == service.frame:
+            # Already triggered this frame; playing it again would only restart it
+            service.coalesced += 1
+            return self.channel
+        self.played_frame = service.frame
+        start = time.perf_counter()
+        self.channel.play(sound)
+        service.record(time.perf_counter() - start)
+        if service.events:
+            service.events("sound", self.name)
+        return self.channel
+
+
+class AudioService:
+    def __init__(self, effects=sound_synth.EFFECTS):
+        self.effects = effects
+        self.proxies = {name: SoundProxy(name, self) for name in effects}
+        self.ready = threading.Event()
+        self.error = None
+        self.init_ms = None  # Time the background thread took to get sound going
+        self.buffer_ms = None  # Output latency added by the device buffer
+        self.music_channel = None
+        self.frame = 0
+        self.triggers = 0
+        self.coalesced = 0
+        self.latencies = []
+        self.events = None  # FrameProfiler.event, passing each trigger to the tracer and watchdog
+        self._thread = None
+
+    def sound(self, name):
+        """Return the proxy for one effect"""
+        return self.proxies[name]
+
+    def start(self, buffer=BUFFER_SIZE, profiler=None):
+        """Open the mixer and load the effects on a background thread
+
+        With a startup.StartupProfiler, the thread reports its phases to it.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(buffer, profiler),
+                                            name="audio-init", daemon=True)
+            self._thread.start()
+        return self
+
+    def done(self):
+        """True once the background thread has finished, successfully or not"""
+        return self.ready.is_set() or self.error is not None
+
+    def wait(self, timeout=None):
+        """Block until sound is ready; return False on timeout or failure"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready.is_set()
+
+    def _run(self, buffer, profiler):
+        started = time.perf_counter()
+        try:
+            # A mixer opened elsewhere (e.g. a stray pygame.init()) has a buffer
+            # that can't be queried; reopen it so the requested one applies
+            if pygame.mixer.get_init() is not None:
+                pygame.mixer.quit()
+            pygame.mixer.init(FREQUENCY, -16, 2, buffer)
+            # Channels 0..n are kept out of Sound.play()'s free-channel search:
+            # one per effect plus one for music
+            pygame.mixer.set_reserved(len(self.proxies) + 1)
+            channels = [pygame.mixer.Channel(index) for index in range(len(self.proxies))]
+            self.music_channel = pygame.mixer.Channel(len(self.proxies))
+            opened = time.perf_counter()
+            # Synthesized in the mixer's own format, then cached on disk for later launches
+            sounds = sound_cache.load_sounds(self.effects)
+            if profiler:
+                profiler.add("mixer open", opened - started, background=True)
+                profiler.add("sound synthesis", time.perf_counter() - opened, background=True)
+        except Exception as e:
+            self.error = e
+            print(f"Could not initialize audio: {e}. Game will run without sound.")
+            return
+        # At the rate the device granted, which may differ from FREQUENCY
+        self.buffer_ms = buffer / sound_synth.mixer_format()[0] * 1000
+        for channel, (name, proxy) in zip(channels, self.proxies.items()):
+            proxy.channel = channel
+            proxy.sound = sounds[name]
+        self.init_ms = (time.perf_counter() - started) * 1000
+        self.ready.set()
+
+    def next_frame(self):
+        """Start a new frame; each effect plays at most once per frame"""
+        self.frame += 1
+
+    def record(self, elapsed):
+        """Record how long one trigger took to reach the mixer"""
+        self.triggers += 1
+        self.latencies.append(elapsed)
+        if len(self.latencies) > LATENCY_WINDOW:
+            del self.latencies[:LATENCY_WINDOW // 2]
+
+    def stats(self):
+        """Return trigger latency statistics in milliseconds
+
+        `play_*` is the time spent handing a sound to the mixer (which waits
+        for the audio lock); `output_*` adds one device buffer on top, the
+        earliest the sound can leave the speakers.
+        """
+        if not self.latencies:
+            return {"triggers": 0, "coalesced": self.coalesced}
+        ordered = sorted(self.latencies)
+        mean = sum(ordered) / len(ordered) * 1000
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+        return {
+            "triggers": self.triggers,
+            "coalesced": self.coalesced,
+            "play_mean_ms": mean,
+            "play_p99_ms": p99,
+            "play_max_ms": ordered[-1] * 1000,
+            "buffer_ms": self.buffer_ms,
+            "output_mean_ms": mean + self.buffer_ms,
+            "output_p99_ms": p99 + self.buffer_ms,
+        }
+
+    def report(self):
+        """Print a one-line latency summary"""
+        stats = self.stats()
+        if stats["triggers"]:
+            print(f"Audio: {stats['triggers']} triggers, {stats['coalesced']} coalesced, "
+                  f"play mean {stats['play_mean_ms']:.3f} ms, p99 {stats['play_p99_ms']:.3f} ms, "
+                  f"buffer {stats['buffer_ms']:.1f} ms, output p99 {stats['output_p99_ms']:.1f} ms")
+        elif self.error is None and not self.ready.is_set():
+            print("Audio: mixer not ready yet")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Autopilot that plays any variant by feeding synthetic key presses
+
+Used as an attract mode on the cabinets and as a repeatable workload for
+frame-time benchmarks.  Decisions look ahead over the current obstacle list
+using the dino's precomputed jump hitboxes and stop early if they run past
+the per-frame budget.
+"""
+import time
+
+import pygame
+
+import dino_physics
+
+RESTART_FRAMES = 90  # Game-over frames before attract mode restarts (~3 seconds)
+LATENCY_WINDOW = 1000  # Recent decisions kept for latency statistics
+
+
+class SyntheticInput:
+    """Stands in for pygame.key.get_pressed() with only UP/DOWN held"""
+
+    def __init__(self, up=False, down=False):
+        self.up = up
+        self.down = down
+
+    def __getitem__(self, key):
+        if key == pygame.K_UP:
+            return self.up
+        if key == pygame.K_DOWN:
+            return self.down
+        return False
+
+
+NO_KEYS = SyntheticInput()
+JUMP = SyntheticInput(up=True)
+DUCK = SyntheticInput(down=True)
+
+
+class Autopilot:
+    def __init__(self, budget_ms=0.5):
+        self.budget = budget_ms / 1000.0
+        self.latencies = []
+        self.decisions = 0
+        self.over_budget = 0
+        self._plans_for = None
+        self._plans = None
+
+    def _build_plans(self, dino):
+        """Precompute the hitboxes each plan gives the dino, frame by frame"""
+        run_box = (dino.x, dino.y, dino.width, dino.height)
+        duck_box = (dino.x, dino.y + dino_physics.DUCK_OFFSET,
+                    dino.duck_img.get_width(), dino.duck_img.get_height())
+        jump_boxes = tuple(tuple(box) for box in dino.jump_hitboxes[1:])
+        horizon = len(dino.jump_arc)
+        # Plans in order of preference; each lists the boxes for frames 1..horizon.
+        # "wait" runs one more frame and jumps on the next one.
+        self._plans = (
+            ("run", NO_KEYS, (run_box,) * horizon),
+            ("duck", DUCK, (duck_box,) * horizon),
+            ("wait", NO_KEYS, (run_box,) + jump_boxes),
+            ("jump", JUMP, jump_boxes + (run_box,)),
+        )
+        self._plans_for = dino
+
+    def _first_hit(self, boxes, paths):
+        """Return the first frame at which the boxes hit any obstacle path"""
+        for frame, (x, y, w, h) in enumerate(boxes, 1):
+            right = x + w
+            bottom = y + h
+            for ox, oy, ow, oh, step in paths:
+                left = ox - step * (frame + 1)
+                if left < right and x < left + ow and oy < bottom and y < oy + oh:
+                    return frame
+        return len(boxes) + 1
+
+    def decide(self, dino, obstacles, game_speed):
+        """Return synthetic input for this frame"""
+        start = time.perf_counter()
+        deadline = start + self.budget
+        if self._plans_for is not dino:
+            self._build_plans(dino)
+
+        choice = NO_KEYS
+        if not dino.is_jumping and obstacles:
+            # Obstacles move once more this frame before collisions are checked
+            paths = []
+            for obstacle in obstacles:
+                multiplier = getattr(obstacle, "speed_multiplier", None)
+                if multiplier:
+                    step = int(game_speed * multiplier)
+                else:
+                    step = dino_physics.round_coord(game_speed)  # pygame.Rect rounds each move
+                rect = obstacle.rect
+                if rect.right > dino.x:
+                    paths.append((rect.x, rect.y, rect.width, rect.height, step))
+
+            # Take the first plan that clears everything in sight, otherwise
+            # the one that survives longest
+            best_input, best_hit = NO_KEYS, -1
+            for name, keys, boxes in self._plans:
+                hit = self._first_hit(boxes, paths)
+                if hit > len(boxes):
+                    best_input = keys
+                    break
+                if hit > best_hit:
+                    best_input, best_hit = keys, hit
+                if time.perf_counter() > deadline:
+                    break
+            choice = best_input
+
+        elapsed = time.perf_counter() - start
+        self.decisions += 1
+        if elapsed > self.budget:
+            self.over_budget += 1
+        self.latencies.append(elapsed)
+        if len(self.latencies) > LATENCY_WINDOW:
+            del self.latencies[:LATENCY_WINDOW // 2]
+        return choice
+
+    def stats(self):
+        """Return decision latency statistics in milliseconds"""
+        if not self.latencies:
+            return {"decisions": 0}
+        ordered = sorted(self.latencies)
+        return {
+            "decisions": self.decisions,
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+            "max_ms": ordered[-1] * 1000,
+            "over_budget": self.over_budget,
+        }
+
+    def report(self):
+        """Print a one-line latency summary"""
+        stats = self.stats()
+        if stats["decisions"]:
+            print(f"Autopilot: {stats['decisions']} decisions, mean {stats['mean_ms']:.3f} ms, "
+                  f"p99 {stats['p99_ms']:.3f} ms, max {stats['max_ms']:.3f} ms, "
+                  f"{stats['over_budget']} over budget")
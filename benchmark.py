@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Frame-time benchmark for every variant under the SDL dummy drivers
+
+Each variant is imported and run in this process with a clock that never
+sleeps, fed a fixed input script generated from the seed (random jumps and
+ducks; a run restarts the frame after it ends), so two runs of the same
+code do the same work.  After the warm-up frames, frame times are
+measured, then a shorter pass with tracemalloc records how much Python
+memory each frame allocates (peak above the frame's starting level), and a
+last pass counts draw calls, blits and surface allocations per frame and
+per calling class with draw_counter.
+
+Results are written as JSON and, with a baseline, compared per variant:
+a mean or p99 frame time more than --threshold above the baseline is a
+regression and makes the exit status 1.
+
+Usage:
+    python benchmark.py --update-baseline
+    python benchmark.py --variant dino_game_futuristic --frames 3000
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# Before pygame is imported anywhere: no window, no audio device
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+import autopilot
+import draw_counter
+import game_options
+import variant_specs
+
+BASELINE = "bench_baseline.json"
+JUMP_CHANCE = 1 / 25  # Per frame
+DUCK_CHANCE = 1 / 40
+DUCK_FRAMES = (10, 20)
+COMPARED = ("mean_ms", "p99_ms")  # Metrics checked against the baseline
+
+
+def input_script(seed, frames):
+    """Return the keys held on each frame, generated from `seed`"""
+    rng = random.Random(seed)
+    script = []
+    while len(script) < frames:
+        roll = rng.random()
+        if roll < JUMP_CHANCE:
+            script.append(autopilot.JUMP)
+        elif roll < JUMP_CHANCE + DUCK_CHANCE:
+            script.extend([autopilot.DUCK] * rng.randint(*DUCK_FRAMES))
+        else:
+            script.append(autopilot.NO_KEYS)
+    return script[:frames]
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class BenchClock:
+    """Replaces a variant's pygame Clock: no frame cap, one sample per tick()"""
+
+    def __init__(self, module, script, warmup, frames, alloc_frames, draw_frames):
+        self.module = module
+        self.script = script
+        self.warmup = warmup
+        self.frames = frames
+        self.alloc_frames = alloc_frames
+        self.draw_frames = draw_frames
+        self.counter = None  # draw_counter.DrawCounter during the last pass
+        self.frame = 0
+        self.times = []
+        self.allocated = []
+        self.collections = 0
+        self._last = None
+        self._traced = 0
+
+    def keys(self):
+        """Stands in for pygame.key.get_pressed()"""
+        return self.script[min(self.frame, len(self.script) - 1)]
+
+    def on_gc(self, phase, info):
+        if phase == "start" and self.warmup <= self.frame < self.warmup + self.frames:
+            self.collections += 1
+
+    def tick(self, framerate=0):
+        now = time.perf_counter()
+        timed_end = self.warmup + self.frames
+        alloc_end = timed_end + self.alloc_frames
+        if self.warmup < self.frame <= timed_end:
+            self.times.append(now - self._last)
+        elif timed_end < self.frame <= alloc_end:
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocated.append(peak - self._traced)
+        elif self.counter:
+            self.counter.next_frame()
+        if self.frame == timed_end and self.alloc_frames:
+            tracemalloc.start()
+        if self.frame == alloc_end:
+            tracemalloc.stop()
+            if self.draw_frames:
+                # Last pass: count draw calls and surfaces through the screen
+                self.counter = draw_counter.DrawCounter().install()
+                self.module.screen = self.counter.wrap(self.module.screen)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        self.frame += 1
+        if self.frame >= alloc_end + self.draw_frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        else:
+            # Restart right after a game over, so nearly every frame is play
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        self._last = time.perf_counter()
+        return 0
+
+    def get_fps(self):
+        return 0.0
+
+
+def run_variant(name, seed, warmup, frames, alloc_frames, draw_frames):
+    """Run one variant and return its frame statistics"""
+    module = importlib.import_module(name)
+    module.start()
+    # Warm the sprite cache first so the title screen is gone on frame 0
+    for _ in module.sprite_set.build_all():
+        pass
+    script = input_script(seed, warmup + frames + alloc_frames + draw_frames)
+    clock = BenchClock(module, script, warmup, frames, alloc_frames, draw_frames)
+    module.clock = clock
+    get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = clock.keys
+    gc.callbacks.append(clock.on_gc)
+    random.seed(seed)
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    try:
+        # Pinned effect detail: the quality governor would tie the work to the timings
+        module.main(game_options.parse_args(["--no-music", "--quality", "full"]))
+    except SystemExit:
+        pass
+    finally:
+        pygame.key.get_pressed = get_pressed
+        gc.callbacks.remove(clock.on_gc)
+        tracemalloc.stop()
+        if clock.counter:
+            clock.counter.uninstall()
+
+    ordered = sorted(clock.times)
+    mean = sum(ordered) / len(ordered)
+    stats = {
+        "frames": len(ordered),
+        "mean_ms": mean * 1000,
+        "p50_ms": percentile(ordered, 0.5) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "fps": 1 / mean if mean else float("inf"),
+        "alloc_kib_per_frame": sum(clock.allocated) / len(clock.allocated) / 1024 if clock.allocated else None,
+        "gc_collections": clock.collections,
+    }
+    if clock.counter:
+        stats.update(clock.counter.averages())
+    return stats
+
+
+def compare(results, baseline, threshold):
+    """Return a list of (variant, metric, baseline, now) regressions"""
+    regressions = []
+    for name, stats in results["variants"].items():
+        before = baseline.get("variants", {}).get(name)
+        if not before:
+            continue
+        for metric in COMPARED:
+            if stats[metric] > before[metric] * (1 + threshold):
+                regressions.append((name, metric, before[metric], stats[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark frame times of every variant")
+    parser.add_argument("--variant", default="all", help="Game module name or 'all'")
+    parser.add_argument("--frames", type=int, default=2000, help="Timed frames per variant")
+    parser.add_argument("--warmup", type=int, default=60, help="Untimed frames before measuring")
+    parser.add_argument("--alloc-frames", type=int, default=300,
+                        help="Frames traced for allocations after the timed ones (0 to skip)")
+    parser.add_argument("--draw-frames", type=int, default=300,
+                        help="Frames with draw/surface counters after the traced ones (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the input script and the game")
+    parser.add_argument("--out", default="bench_results.json", help="Where to write the results")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed slowdown over the baseline (0.1 = 10%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    try:
+        variants = variant_specs.select(args.variant)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "variants": {},
+    }
+    for name in variants:
+        stats = run_variant(name, args.seed, args.warmup, args.frames, args.alloc_frames, args.draw_frames)
+        results["variants"][name] = stats
+        alloc = stats["alloc_kib_per_frame"]
+        print(f"{name}: mean {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f}, "
+              f"p95 {stats['p95_ms']:.2f}, p99 {stats['p99_ms']:.2f}, max {stats['max_ms']:.2f} "
+              f"({stats['fps']:,.0f} fps)" + (f", {alloc:.1f} KiB allocated/frame" if alloc is not None else ""))
+        if "draws_per_frame" in stats:
+            print(f"  per frame: {stats['draws_per_frame']:.0f} draws, {stats['blits_per_frame']:.0f} blits, "
+                  f"{stats['surfaces_per_frame']:.1f} surfaces ({stats['surface_kib_per_frame']:.0f} KiB)")
+
+    with open(args.out, "w", encoding="utf-8") as out:
+        json.dump(results, out, indent=2, sort_keys=True)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, before, now in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.2f} -> {now:.2f} ms "
+              f"(+{(now / before - 1) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Build-time sprite compiler
+
+Draws every sprite a variant registers in its SpriteSet and packs the
+frames into one atlas file per variant under assets/, which the game
+memory-maps at start instead of running its drawing code.  An atlas is
+tied to the exact source of its variant, so rebuild after changing any
+drawing code (a stale atlas is ignored, not misused).
+
+Usage:
+    python build_assets.py
+    python build_assets.py --variant dino_game_space --out /tmp/assets
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+import time
+
+import sprites
+import variant_specs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile sprite atlases")
+    parser.add_argument("--variant", default="all", help="Game module name or 'all'")
+    parser.add_argument("--out", default=sprites.ASSET_DIR, help="Directory for the .atlas files")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for randomized sprites, so builds are reproducible")
+    args = parser.parse_args(argv)
+
+    try:
+        variants = variant_specs.select(args.variant)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for variant in variants:
+        # Importing a variant no longer opens a window; drawing needs none
+        sprite_set = importlib.import_module(variant).sprite_set
+        random.seed(args.seed)
+        start = time.perf_counter()
+        path = sprite_set.save_atlas(sprite_set.atlas_path(args.out))
+        elapsed = time.perf_counter() - start
+        frames = sum(len(surfaces) for variants in sprite_set.cache.values() for surfaces in variants)
+        print(f"{variant}: {frames} frames, {os.path.getsize(path) / 1024:.0f} KiB "
+              f"in {elapsed * 1000:.0f} ms -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
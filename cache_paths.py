@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""Location of the per-user cache shared by sound_cache and fonts"""
+import os
+
+
+def cache_dir():
+    """Return the directory used for cached assets (DINO_CACHE_DIR overrides)"""
+    override = os.environ.get("DINO_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") \
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "run-dino-run")
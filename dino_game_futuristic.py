@@ -1,13 +1,31 @@
 #!/usr/bin/env python3
 import pygame
 import random
-import sys
-import os
-import math  # Import the standard math module
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()  # Initialize the mixer for sound
+import audio
+import autopilot
+import dino_physics
+import draw_counter
+import fonts
+import frame_profiler
+import game_options
+import game_state
+import gc_pacing
+import idle_screen
+import metrics_server
+import music
+import quality_governor
+import quit_steps
+import rewind
+import sampler
+import sprites
+import startup
+import title_screen
+import trace_export
+import watchdog
+
+# Started at import so the time to first frame includes module loading
+startup_profile = startup.StartupProfiler()
 
 # Constants
 SCREEN_WIDTH = 800
@@ -28,76 +46,20 @@ CYBER_YELLOW = (255, 211, 25)
 score = 0
 game_speed = 10
 high_score = 0
+session = None  # Snapshot/restore handles while main() runs
 
-# Create screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Futuristic T-Rex Runner")
-clock = pygame.time.Clock()
-
-# Load font
-try:
-    font = pygame.font.SysFont("Arial", 20)
-    title_font = pygame.font.SysFont("Arial", 30, bold=True)
-except:
-    font = pygame.font.Font(None, 20)
-    title_font = pygame.font.Font(None, 30)
-
-# Sound variables
-jump_sound = None
-collision_sound = None
-point_sound = None
-
-# Create sound files
-def create_sound_files():
-    global jump_sound, collision_sound, point_sound
-    
-    # Create a simple jump sound
-    sample_rate = 44100
-    duration = 0.2  # seconds
-    frequency = 800  # Hz
-    
-    # Generate a simple sine wave for jump sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        value = int(127 * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    jump_sound = pygame.mixer.Sound(buffer=bytes(buf))
-    
-    # Create a simple collision sound (lower tone)
-    duration = 0.3  # seconds
-    frequency = 200  # Hz
-    
-    # Generate a simple sine wave with decay for collision sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        decay = 1 - (t / duration)
-        value = int(127 * decay * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    collision_sound = pygame.mixer.Sound(buffer=bytes(buf))
-    
-    # Create a simple point sound (high beep)
-    duration = 0.1  # seconds
-    frequency = 1200  # Hz
-    
-    # Generate a simple sine wave for point sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        value = int(127 * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    point_sound = pygame.mixer.Sound(buffer=bytes(buf))
+# Window, clock and fonts are created by start() so importing stays cheap
+screen = None
+clock = None
+font = None
+title_font = None
+background = None
 
-# Try to create sound files
-try:
-    create_sound_files()
-    print("Sound effects created successfully!")
-except Exception as e:
-    print(f"Could not create sound files: {e}. Game will run without sound.")
+# Sound effects: silent proxies until audio_service has opened the mixer
+audio_service = audio.AudioService()
+jump_sound = audio_service.sound("jump")
+collision_sound = audio_service.sound("collision")
+point_sound = audio_service.sound("point")
 
 # Create futuristic background elements
 def create_grid_background():
@@ -120,8 +82,16 @@ def create_grid_background():
     
     return bg
 
-# Create background
-background = create_grid_background()
+# Effect detail per quality level, full detail first.  With --quality auto
+# the governor steps down this list while frames run over budget and back
+# up when there is headroom again (see quality_governor.py)
+QUALITY_LEVELS = [
+    {"trail": 6, "pulse": True, "twinkle": True, "stars": 50, "glow": True},
+    {"trail": 4, "pulse": False, "twinkle": False, "stars": 50, "glow": True},
+    {"trail": 2, "pulse": False, "twinkle": False, "stars": 30, "glow": False},
+    {"trail": 0, "pulse": False, "twinkle": False, "stars": 15, "glow": False},
+]
+quality = quality_governor.QualityGovernor(QUALITY_LEVELS)
 
 # Create stars for the background
 stars = []
@@ -130,87 +100,103 @@ for _ in range(50):
 
 class TRex:
     def __init__(self):
-        # Create a T-Rex shape
-        self.width = 60
-        self.height = 70
+        # Frames are drawn once by draw_frames() and shared through the sprite cache
+        frames = sprite_set.get("trex")
+        self.run_imgs = list(frames[:2])
+        self.jump_img = frames[2]
+        self.duck_img = frames[3]
+        self.width, self.height = self.run_imgs[0].get_size()
         self.x = 80
         self.y = GROUND_HEIGHT - self.height
         self.jump_vel = 8.5
         self.is_jumping = False
         self.is_ducking = False
-        self.vel_y = 0
+        self.jump_frame = 0  # Frames since takeoff
         self.step_index = 0
         
+        self.image = self.run_imgs[0]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x
+        self.rect.y = self.y
+        
+        # Jump arc and per-frame hitboxes are computed once per jump_vel
+        self.jump_arc = dino_physics.jump_arc(self.jump_vel)
+        self.jump_hitboxes = dino_physics.jump_hitboxes(self.x, self.y, self.width, self.height, self.jump_arc)
+        
+        # Add neon trail effect
+        self.trail_positions = []
+        
+    @staticmethod
+    def draw_frames():
+        """Return the two run frames, the jump frame and the duck frame"""
+        # Create a T-Rex shape
+        width = 60
+        height = 70
+        
         # Create T-Rex images for animation
-        self.run_imgs = []
+        run_imgs = []
         for i in range(2):
-            img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            img = pygame.Surface((width, height), pygame.SRCALPHA)
             
             # T-Rex body (dark green with neon highlights)
             body_color = (20, 100, 50)
             highlight_color = NEON_GREEN
             
             # Body
-            pygame.draw.ellipse(img, body_color, (5, 10, self.width-15, self.height-30))
+            pygame.draw.ellipse(img, body_color, (5, 10, width-15, height-30))
             
             # Head
-            pygame.draw.ellipse(img, body_color, (self.width-25, 5, 25, 20))
+            pygame.draw.ellipse(img, body_color, (width-25, 5, 25, 20))
             
             # Jaw
-            pygame.draw.ellipse(img, body_color, (self.width-20, 15, 20, 10))
+            pygame.draw.ellipse(img, body_color, (width-20, 15, 20, 10))
             
             # Tail
             pygame.draw.ellipse(img, body_color, (0, 20, 20, 10))
             
             # Legs
             leg_height = 25 if i == 0 else 20
-            pygame.draw.rect(img, body_color, (15, self.height-leg_height, 10, leg_height))
-            pygame.draw.rect(img, body_color, (35, self.height-leg_height-5, 10, leg_height+5))
+            pygame.draw.rect(img, body_color, (15, height-leg_height, 10, leg_height))
+            pygame.draw.rect(img, body_color, (35, height-leg_height-5, 10, leg_height+5))
             
             # Neon highlights
-            pygame.draw.line(img, highlight_color, (10, 20), (self.width-20, 20), 2)
-            pygame.draw.line(img, highlight_color, (self.width-15, 10), (self.width-5, 10), 2)
+            pygame.draw.line(img, highlight_color, (10, 20), (width-20, 20), 2)
+            pygame.draw.line(img, highlight_color, (width-15, 10), (width-5, 10), 2)
             
             # Eye (glowing)
-            pygame.draw.circle(img, NEON_BLUE, (self.width-10, 10), 4)
-            pygame.draw.circle(img, WHITE, (self.width-10, 10), 2)
+            pygame.draw.circle(img, NEON_BLUE, (width-10, 10), 4)
+            pygame.draw.circle(img, WHITE, (width-10, 10), 2)
             
             # Teeth
             for j in range(3):
-                pygame.draw.rect(img, WHITE, (self.width-15+j*5, 20, 2, 4))
+                pygame.draw.rect(img, WHITE, (width-15+j*5, 20, 2, 4))
             
-            self.run_imgs.append(img)
+            run_imgs.append(img)
             
         # Jump image
-        self.jump_img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        jump_img = pygame.Surface((width, height), pygame.SRCALPHA)
         # Copy the first run image but adjust the legs
-        self.jump_img.blit(self.run_imgs[0], (0, 0))
+        jump_img.blit(run_imgs[0], (0, 0))
         # Clear the leg area
-        pygame.draw.rect(self.jump_img, (0, 0, 0, 0), (10, self.height-30, 40, 30))
+        pygame.draw.rect(jump_img, (0, 0, 0, 0), (10, height-30, 40, 30))
         # Draw tucked legs
-        pygame.draw.ellipse(self.jump_img, body_color, (15, self.height-20, 30, 15))
+        pygame.draw.ellipse(jump_img, body_color, (15, height-20, 30, 15))
         
         # Duck image (shorter and longer)
-        self.duck_img = pygame.Surface((self.width+10, self.height-20), pygame.SRCALPHA)
+        duck_img = pygame.Surface((width+10, height-20), pygame.SRCALPHA)
         # Stretched body
-        pygame.draw.ellipse(self.duck_img, body_color, (5, 5, self.width, 20))
+        pygame.draw.ellipse(duck_img, body_color, (5, 5, width, 20))
         # Head
-        pygame.draw.ellipse(self.duck_img, body_color, (self.width-15, 0, 25, 15))
+        pygame.draw.ellipse(duck_img, body_color, (width-15, 0, 25, 15))
         # Jaw
-        pygame.draw.ellipse(self.duck_img, body_color, (self.width-10, 10, 20, 8))
+        pygame.draw.ellipse(duck_img, body_color, (width-10, 10, 20, 8))
         # Eye
-        pygame.draw.circle(self.duck_img, NEON_BLUE, (self.width-5, 5), 3)
-        pygame.draw.circle(self.duck_img, WHITE, (self.width-5, 5), 1)
+        pygame.draw.circle(duck_img, NEON_BLUE, (width-5, 5), 3)
+        pygame.draw.circle(duck_img, WHITE, (width-5, 5), 1)
         # Neon highlights
-        pygame.draw.line(self.duck_img, highlight_color, (10, 10), (self.width-20, 10), 2)
+        pygame.draw.line(duck_img, highlight_color, (10, 10), (width-20, 10), 2)
         
-        self.image = self.run_imgs[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        # Add neon trail effect
-        self.trail_positions = []
+        return run_imgs[0], run_imgs[1], jump_img, duck_img
         
     def update(self, user_input):
         if self.is_jumping:
@@ -235,27 +221,37 @@ class TRex:
         if self.step_index >= 10:
             self.step_index = 0
             
-        # Update trail
-        if len(self.trail_positions) > 5:
+        # Update trail, as long as the quality level allows
+        while self.trail_positions and len(self.trail_positions) >= quality.settings["trail"]:
             self.trail_positions.pop(0)
-        self.trail_positions.append((self.rect.x, self.rect.y))
+        if quality.settings["trail"]:
+            self.trail_positions.append((self.rect.x, self.rect.y))
             
     def jump(self):
         self.image = self.jump_img
-        if self.is_jumping:
-            self.rect.y -= self.vel_y * 4
-            self.vel_y -= 0.8
+        # Look up this frame of the precomputed jump arc
+        self.jump_frame += 1
+        self.rect.update(self.jump_hitboxes[self.jump_frame])
             
-        if self.vel_y < -self.jump_vel:
+        if self.jump_frame >= len(self.jump_arc) - 1:
             self.is_jumping = False
-            self.vel_y = self.jump_vel
-            self.rect.y = self.y
+            self.jump_frame = 0
+            
+    def predict_rect(self, frames_ahead):
+        """Return the hitbox frames_ahead frames from now if no key is pressed"""
+        if self.is_jumping:
+            frame = self.jump_frame + frames_ahead
+            if frame < len(self.jump_arc):
+                return pygame.Rect(self.jump_hitboxes[frame])
+        if self.is_ducking:
+            return self.duck_img.get_rect(topleft=(self.x, self.y + dino_physics.DUCK_OFFSET))
+        return self.run_imgs[0].get_rect(topleft=(self.x, self.y))
             
     def duck(self):
         self.image = self.duck_img
         self.rect = self.image.get_rect()
         self.rect.x = self.x
-        self.rect.y = self.y + 20  # Adjust y position when ducking
+        self.rect.y = self.y + dino_physics.DUCK_OFFSET  # Adjust y position when ducking
         self.step_index += 1
             
     def run(self):
@@ -297,54 +293,75 @@ class FuturisticObstacle:
 class CyberCactus(FuturisticObstacle):
     def __init__(self, image=None):
         self.type = random.randint(0, 2)
+        # The spike and its glow frames are drawn once per type by draw_frames()
+        frames = sprite_set.get(f"spike.{self.type}")
+        self.image = self.spike = frames[0]
+        self.glow_frames = list(frames[1:])
+        
+        super().__init__(self.image, self.type)
+        self.rect.y = GROUND_HEIGHT - self.rect.height
         
+        # Add pulsing effect variables
+        self.pulse_counter = random.randint(0, 20)
+        
+    @staticmethod
+    def draw_frames(kind):
+        """Return the spike of the given type followed by its 21 glow frames"""
         # Create futuristic cactus/spike images
-        if self.type == 0:
+        if kind == 0:
             # Small spike
             width, height = 20, 40
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Base
-            pygame.draw.rect(self.image, NEON_PINK, (0, height-10, width, 10))
+            pygame.draw.rect(image, NEON_PINK, (0, height-10, width, 10))
             # Spike
-            pygame.draw.polygon(self.image, NEON_PINK, [(width//2, 0), (0, height-10), (width, height-10)])
+            pygame.draw.polygon(image, NEON_PINK, [(width//2, 0), (0, height-10), (width, height-10)])
             # Highlight
-            pygame.draw.line(self.image, WHITE, (width//2, 5), (width//2, height-15), 2)
-        elif self.type == 1:
+            pygame.draw.line(image, WHITE, (width//2, 5), (width//2, height-15), 2)
+        elif kind == 1:
             # Medium spike cluster
             width, height = 40, 60
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Base
-            pygame.draw.rect(self.image, NEON_PINK, (0, height-10, width, 10))
+            pygame.draw.rect(image, NEON_PINK, (0, height-10, width, 10))
             # Multiple spikes
-            pygame.draw.polygon(self.image, NEON_PINK, [(10, 10), (0, height-10), (20, height-10)])
-            pygame.draw.polygon(self.image, NEON_PINK, [(30, 0), (20, height-10), (40, height-10)])
+            pygame.draw.polygon(image, NEON_PINK, [(10, 10), (0, height-10), (20, height-10)])
+            pygame.draw.polygon(image, NEON_PINK, [(30, 0), (20, height-10), (40, height-10)])
             # Highlights
-            pygame.draw.line(self.image, WHITE, (10, 15), (10, height-15), 1)
-            pygame.draw.line(self.image, WHITE, (30, 5), (30, height-15), 1)
+            pygame.draw.line(image, WHITE, (10, 15), (10, height-15), 1)
+            pygame.draw.line(image, WHITE, (30, 5), (30, height-15), 1)
         else:
             # Large energy barrier
             width, height = 50, 80
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Base
-            pygame.draw.rect(self.image, NEON_BLUE, (0, height-10, width, 10))
+            pygame.draw.rect(image, NEON_BLUE, (0, height-10, width, 10))
             # Energy field
             for i in range(0, height-10, 5):
                 alpha = 150 - i
                 if alpha < 0:
                     alpha = 0
-                pygame.draw.rect(self.image, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], alpha), 
+                pygame.draw.rect(image, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], alpha), 
                                 (5, i, width-10, 5))
             # Frame
-            pygame.draw.rect(self.image, NEON_BLUE, (0, 0, 5, height))
-            pygame.draw.rect(self.image, NEON_BLUE, (width-5, 0, 5, height))
-            
-        super().__init__(self.image, self.type)
-        self.rect.y = GROUND_HEIGHT - height
+            pygame.draw.rect(image, NEON_BLUE, (0, 0, 5, height))
+            pygame.draw.rect(image, NEON_BLUE, (width-5, 0, 5, height))
+        
+        # One glow frame per pulse_counter value (0-20), 5 pixels larger all round
+        frames = [image]
+        glow_color = NEON_PINK if kind < 2 else NEON_BLUE
+        for pulse_counter in range(21):
+            pulse_intensity = abs(10 - pulse_counter) / 10
+            glow_surf = pygame.Surface((width + 10, height + 10), pygame.SRCALPHA)
+            pygame.draw.rect(glow_surf, (glow_color[0], glow_color[1], glow_color[2], 50 * pulse_intensity), 
+                            (0, 0, width + 10, height + 10))
+            temp_surf = pygame.Surface((width + 10, height + 10), pygame.SRCALPHA)
+            temp_surf.blit(glow_surf, (0, 0))
+            temp_surf.blit(image, (5, 5))
+            frames.append(temp_surf)
+        
+        return tuple(frames)
         
-        # Add pulsing effect variables
-        self.pulse_counter = random.randint(0, 20)
-        self.original_image = self.image.copy()
-
     def update(self):
         super().update()
         
@@ -353,30 +370,35 @@ class CyberCactus(FuturisticObstacle):
         if self.pulse_counter > 20:
             self.pulse_counter = 0
             
-        pulse_intensity = abs(10 - self.pulse_counter) / 10
-        
-        # Create a copy of the original image for the pulse effect
-        self.image = self.original_image.copy()
+        # Pre-composed glow frame (the hitbox stays the size of the spike)
+        self.image = self.glow_frames[self.pulse_counter]
         
-        # Add a glow based on the type
-        glow_color = NEON_PINK if self.type < 2 else NEON_BLUE
-        glow_surf = pygame.Surface((self.rect.width + 10, self.rect.height + 10), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (glow_color[0], glow_color[1], glow_color[2], 50 * pulse_intensity), 
-                        (0, 0, self.rect.width + 10, self.rect.height + 10))
-        
-        # Blit the glow onto the image
-        temp_surf = pygame.Surface((self.rect.width + 10, self.rect.height + 10), pygame.SRCALPHA)
-        temp_surf.blit(glow_surf, (0, 0))
-        temp_surf.blit(self.image, (5, 5))
-        self.image = temp_surf
-        self.rect = self.image.get_rect(bottomright=self.rect.bottomright)
+    def draw(self, screen):
+        if not quality.settings["glow"]:
+            screen.blit(self.spike, self.rect)
+            return
+        # The glow extends 5 pixels around the hitbox
+        screen.blit(self.image, (self.rect.x - 5, self.rect.y - 5))
 
 class CyberDrone(FuturisticObstacle):
     def __init__(self):
         self.type = 0
+        self.images = list(sprite_set.get("drone"))  # Drawn once by draw_frames()
+        self.image = self.images[0]
+        self.index = 0
         
+        # Random height for the drone
+        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
+        self.height = random.choice(height_options)
+        
+        super().__init__(self.image, self.type)
+        self.rect.y = self.height
+        
+    @staticmethod
+    def draw_frames():
+        """Return the two propeller frames"""
         # Create futuristic drone images for animation
-        self.images = []
+        images = []
         for i in range(2):
             # Drone with different propeller positions
             width, height = 50, 30
@@ -405,17 +427,9 @@ class CyberDrone(FuturisticObstacle):
                                 (0, j), (20, j), 1)
             img.blit(beam_surf, (15, height))
             
-            self.images.append(img)
-            
-        self.image = self.images[0]
-        self.index = 0
+            images.append(img)
         
-        # Random height for the drone
-        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
-        self.height = random.choice(height_options)
-        
-        super().__init__(self.image, self.type)
-        self.rect.y = self.height
+        return tuple(images)
         
     def update(self):
         # Drone animation
@@ -428,60 +442,77 @@ class CyberDrone(FuturisticObstacle):
 
 class HologramCloud:
     def __init__(self):
-        self.width = random.randint(60, 120)
-        self.height = random.randint(30, 50)
+        # Random-sized cloud with its pulse already rendered; drawn by draw_frames()
+        self.pulse_frames = list(sprite_set.get("hologram"))
+        self.width, self.height = self.pulse_frames[0].get_size()
         self.x = SCREEN_WIDTH
         self.y = random.randint(50, 200)
         self.speed = random.randint(1, 3)
         
+        # Pulse effect variables
+        self.pulse_counter = random.randint(0, 20)
+        self.image = self.pulse_frames[self.pulse_counter]
+        
+    @staticmethod
+    def draw_frames():
+        """Return a random cloud as 21 pulse frames, one per pulse_counter value"""
+        width = random.randint(60, 120)
+        height = random.randint(30, 50)
+        
         # Create a holographic cloud image
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
         
         # Draw holographic effect
         for i in range(3):  # Draw multiple shapes for cloud puffs
-            radius = self.height // 2
-            center_x = self.width // 4 + (i * self.width // 4)
-            center_y = self.height // 2
+            radius = height // 2
+            center_x = width // 4 + (i * width // 4)
+            center_y = height // 2
             
             # Draw with scanlines effect
             for j in range(0, radius*2, 2):
                 alpha = 100 - (j * 2)
                 if alpha < 0:
                     alpha = 0
-                pygame.draw.circle(self.image, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], alpha), 
+                pygame.draw.circle(image, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], alpha), 
                                   (center_x, center_y), radius - j//2, 1)
         
         # Add some random "data" points
         for _ in range(5):
-            x = random.randint(0, self.width)
-            y = random.randint(0, self.height)
+            x = random.randint(0, width)
+            y = random.randint(0, height)
             size = random.randint(1, 3)
-            pygame.draw.circle(self.image, CYBER_YELLOW, (x, y), size)
+            pygame.draw.circle(image, CYBER_YELLOW, (x, y), size)
         
-        # Pulse effect variables
-        self.pulse_counter = random.randint(0, 20)
-        self.original_image = self.image.copy()
+        # Adjust transparency based on pulse; only the lit pixels change
+        lit = []
+        for x in range(width):
+            for y in range(height):
+                color = image.get_at((x, y))
+                if color.a > 0:
+                    lit.append((x, y, color))
+        frames = []
+        for pulse_counter in range(21):
+            pulse_intensity = abs(10 - pulse_counter) / 10
+            frame = image.copy()
+            for x, y, color in lit:
+                new_alpha = int(color.a * (0.7 + 0.3 * pulse_intensity))
+                frame.set_at((x, y), (color.r, color.g, color.b, new_alpha))
+            frames.append(frame)
+        
+        return tuple(frames)
         
     def update(self):
         self.x -= self.speed
         if self.x < -self.width:
             clouds.remove(self)
             
-        # Pulsing effect
-        self.pulse_counter += 1
-        if self.pulse_counter > 20:
-            self.pulse_counter = 0
+        # Pulsing effect, held on its current frame at lower quality
+        if quality.settings["pulse"]:
+            self.pulse_counter += 1
+            if self.pulse_counter > 20:
+                self.pulse_counter = 0
             
-        pulse_intensity = abs(10 - self.pulse_counter) / 10
-        self.image = self.original_image.copy()
-        
-        # Adjust transparency based on pulse
-        for x in range(self.width):
-            for y in range(self.height):
-                color = self.image.get_at((x, y))
-                if color.a > 0:
-                    new_alpha = int(color.a * (0.7 + 0.3 * pulse_intensity))
-                    self.image.set_at((x, y), (color.r, color.g, color.b, new_alpha))
+        self.image = self.pulse_frames[self.pulse_counter]
             
     def draw(self, screen):
         screen.blit(self.image, (self.x, self.y))
@@ -490,11 +521,60 @@ class HologramCloud:
 NEON_RED = (255, 0, 60)
 NEON_BLUE_ALPHA = (0, 195, 255, 100)
 
-def main():
-    global game_speed, score, obstacles, clouds, high_score
+# Every sprite this variant draws.  Each one is drawn on first use, or sliced
+# from the compiled atlas (python build_assets.py) when that is up to date.
+sprite_set = sprites.SpriteSet(__file__)
+sprite_set.add("trex", TRex.draw_frames)
+sprite_set.add("spike.0", lambda: CyberCactus.draw_frames(0))
+sprite_set.add("spike.1", lambda: CyberCactus.draw_frames(1))
+sprite_set.add("spike.2", lambda: CyberCactus.draw_frames(2))
+sprite_set.add("drone", CyberDrone.draw_frames)
+sprite_set.add("hologram", HologramCloud.draw_frames, variants=sprites.RANDOM_VARIANTS)  # Random sizes
+sprite_set.add("grid", lambda: (create_grid_background(),))
+
+
+def start():
+    """Initialize pygame and create the window, clock and fonts; safe to call again"""
+    global screen, clock, font, title_font, background
+    if screen is not None:
+        return
+    with startup_profile.phase("pygame init"):
+        # The mixer is opened in the background by audio_service
+        audio.init_pygame()
+    with startup_profile.phase("display"):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Futuristic T-Rex Runner")
+        clock = pygame.time.Clock()
+    with startup_profile.phase("font lookup"):
+        # Resolved once and cached; falls back to pygame's bundled font
+        font = fonts.load("Arial", 20)
+        title_font = fonts.load("Arial", 30, bold=True)
+    with startup_profile.phase("atlas load"):
+        sprite_set.load_atlas()
+    with startup_profile.phase("sprite generation"):
+        background = sprite_set.get("grid")[0]
+
+
+def main(options=None):
+    global game_speed, score, obstacles, clouds, high_score, session, screen
+    if options is None:
+        options = game_options.parse_args([])
+    start()
+    on_quit = quit_steps.QuitSteps()  # Reports and cleanups for exit, in order
+    audio_service.start(options.audio_buffer, startup_profile)  # Opens the mixer without delaying the first frame
+    soundtrack = music.MusicStream(audio_service).start() if options.music else None
+    on_quit.add(soundtrack and soundtrack.stop)
+    on_quit.add(options.audio_stats and audio_service.report)
+    
+    # Title screen while every sprite is drawn in the background, so play
+    # never starts with a cold cache
+    if not title_screen.show(screen, clock, font, sprite_set, NEON_BLUE, background,
+                             autostart=options.autopilot, profiler=startup_profile):
+        on_quit.run()
     
     # Create game objects
-    dino = TRex()
+    with startup_profile.phase("sprite generation"):
+        dino = TRex()
     obstacles = []
     clouds = []
     
@@ -505,6 +585,51 @@ def main():
     cloud_timer = 0
     point_milestone = 100  # For playing point sound every 100 points
     
+    # Autopilot plays with synthetic input when enabled (attract mode)
+    pilot = autopilot.Autopilot(options.autopilot_budget_ms) if options.autopilot else None
+    on_quit.add(pilot and pilot.report)
+    # Per-phase timings and overlay (F3); free while switched off.  --trace
+    # streams the same timings plus spawns, collisions and sounds to a file
+    tracer = trace_export.TraceWriter(options.trace) if options.trace else None
+    on_quit.add(tracer and tracer.close)
+    # Draw-call and surface allocation counters (--draw-stats) wrap the screen
+    draw_stats = draw_counter.DrawCounter().install() if options.draw_stats else None
+    on_quit.add(draw_stats and draw_stats.report)
+    if draw_stats:
+        screen = draw_stats.wrap(screen)
+    # Live counts and score for the watchdog log and the metrics endpoint
+    def live_entities():
+        return {"obstacles": len(obstacles), "clouds": len(clouds),
+                "trail": len(dino.trail_positions)}
+    def score_stats():
+        return {"score": score, "high_score": high_score, "game_speed": game_speed, "game_over": int(game_over),
+                "quality_level": quality.level}
+    # Frames over --watchdog-ms get their phases, entity counts and stack logged
+    frame_watchdog = watchdog.FrameWatchdog(options.watchdog_ms, counts=live_entities) if options.watchdog_ms else None
+    on_quit.add(frame_watchdog and frame_watchdog.close)
+    # Effects step down while frames run over budget (--quality)
+    quality.set_mode(options.quality)
+    governed = options.quality == "auto"  # A pinned level needs no frame timings
+    # Prometheus text format on --metrics-port for remote monitoring
+    metrics = None
+    if options.metrics_port is not None:
+        metrics = metrics_server.MetricsServer(options.metrics_port, options.metrics_host, entities=live_entities,
+                                               gauges=score_stats, caches={"sprites": sprite_set, "text": font, "title_text": title_font})
+    on_quit.add(metrics and metrics.close)
+    phase_timer = frame_profiler.FrameProfiler(options.frame_profile, tracer=tracer, counters=draw_stats,
+                                               listeners=(frame_watchdog, metrics, governed and quality))
+    # --gc-pacing freezes startup objects and collects in spare frame time only
+    gc_pacer = gc_pacing.GCPacer(options.gc_pacing, profiler=phase_timer)
+    on_quit.add(options.gc_pacing and gc_pacer.report)
+    # Game-over and pause screens sleep until a key; attract mode wakes up to restart
+    idle = idle_screen.IdleScreen(phase_timer, wake_ms=autopilot.RESTART_FRAMES * 1000 // 30 if pilot else None)
+    paused = False
+    # Flamegraph-ready stack samples of the loop until exit (--profile-sample)
+    stack_sampler = sampler.StackSampler().start() if options.profile_sample else None
+    on_quit.add(stack_sampler and stack_sampler.write, options.profile_sample)
+    audio_service.events = phase_timer.event
+    game_over_frames = 0
+    
     # Ground effect variables
     ground_scroll = 0
     ground_speed = 5
@@ -524,31 +649,92 @@ def main():
         dino.rect.y = dino.y
         dino.is_jumping = False
         dino.is_ducking = False
-        dino.vel_y = dino.jump_vel
+        dino.jump_frame = 0
+        rewinder.clear()
         dino.trail_positions = []
     
+    def snapshot(full=True):
+        """Capture the session as an immutable GameSnapshot
+
+        full=False skips scenery and RNG state for cheap per-frame captures.
+        """
+        return game_state.capture(dino, obstacles, clouds, score, game_speed, high_score,
+                                  (game_over, obstacle_timer, cloud_timer, point_milestone, ground_scroll, game_over_frames),
+                                  (stars,) if full else (), rng=full)
+    
+    def restore(snap):
+        """Return the session to an earlier snapshot"""
+        nonlocal game_over, obstacle_timer, cloud_timer, point_milestone, ground_scroll, game_over_frames
+        global game_speed, score, obstacles, clouds, high_score
+        obstacles, clouds = game_state.restore_entities(snap, (stars,))
+        game_speed, score = snap.game_speed, snap.score
+        high_score = max(high_score, snap.high_score)  # A rewind never takes back a record
+        game_over, obstacle_timer, cloud_timer, point_milestone, ground_scroll, game_over_frames = snap.timers
+    
+    session = game_state.Session(snapshot, restore)
+    quick_save = None
+    rewinder = rewind.RewindBuffer()
+    
     while run:
-        for event in pygame.event.get():
+        events = idle.events(game_over, paused)  # Blocks while the idle screen is up
+        phase_timer.frame()  # Closes the previous frame's phase timings
+        if draw_stats:
+            draw_stats.next_frame()
+        audio_service.next_frame()  # Repeated sound triggers within one frame play once
+        if soundtrack:
+            soundtrack.set_speed(game_speed)  # Music tempo follows the game
+            soundtrack.set_paused(paused or game_over)  # Silent while the idle screen sleeps
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
-                pygame.quit()
-                sys.exit()
+                on_quit.run()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and game_over:
                     reset_game()
+                # Quick save / quick load of the whole session
+                if event.key == pygame.K_F5:
+                    quick_save = snapshot()
+                elif event.key == pygame.K_F9 and quick_save and not paused:
+                    # Not while paused: the loaded state couldn't be drawn without stepping it
+                    restore(quick_save)
+                elif event.key == pygame.K_F3:
+                    phase_timer.toggle()
+                elif event.key == idle_screen.PAUSE_KEY and not game_over:
+                    paused = not paused
+                    if soundtrack:
+                        soundtrack.set_paused(paused)
+                    if paused:
+                        idle_screen.draw_paused(screen, font, NEON_BLUE)
+        phase_timer.mark("events")
+        if paused:
+            continue  # Simulation halted; the captioned frame stays up
         
         # Get user input
         user_input = pygame.key.get_pressed()
+        rewind_held = user_input[pygame.K_LEFT]
+        if pilot:
+            user_input = pilot.decide(dino, obstacles, game_speed)
+        
+        # Hold LEFT to rewind the last few seconds, otherwise record this frame
+        if rewind_held and rewinder.frames:
+            restore(rewinder.rewind())
+        elif not game_over:
+            rewinder.push(snapshot(full=False))
+        
+        phase_timer.mark("input")
         
         # Draw background
         screen.blit(background, (0, 0))
         
-        # Update and draw stars (twinkling effect)
-        for star in stars:
-            # Twinkle effect
-            brightness = random.randint(150, 255)
-            color = (brightness, brightness, brightness)
-            pygame.draw.circle(screen, color, (star[0], star[1]), star[2])
+        # Update and draw stars (twinkling effect); fewer of them drawn at lower quality
+        twinkle = quality.settings["twinkle"]
+        shown = quality.settings["stars"]  # All of them keep moving so none freeze while hidden
+        for index, star in enumerate(stars):
+            if index < shown:
+                # Twinkle effect
+                brightness = random.randint(150, 255) if twinkle else 200
+                color = (brightness, brightness, brightness)
+                pygame.draw.circle(screen, color, (star[0], star[1]), star[2])
             
             # Move stars for parallax effect
             star[0] -= star[2] // 2
@@ -556,6 +742,8 @@ def main():
                 star[0] = SCREEN_WIDTH
                 star[1] = random.randint(0, GROUND_HEIGHT - 50)
         
+        phase_timer.mark("background")
+        
         if not game_over:
             # Update game speed and score
             if score % 100 == 0 and score > 0:
@@ -579,19 +767,25 @@ def main():
                     obstacles.append(CyberDrone())
                 else:  # 2/3 chance for cyber cactus
                     obstacles.append(CyberCactus())
+                phase_timer.event("spawn", type(obstacles[-1]).__name__)
                 obstacle_timer = 0
                 
             # Generate clouds
             cloud_timer += 1
             if cloud_timer >= random.randint(75, 150):
                 clouds.append(HologramCloud())
+                phase_timer.event("spawn", type(clouds[-1]).__name__)
                 cloud_timer = 0
             
+            phase_timer.mark("spawn")
+            
             # Update and draw clouds
             for cloud in list(clouds):
                 cloud.update()
                 cloud.draw(screen)
             
+            phase_timer.mark("clouds")
+            
             # Draw futuristic ground
             ground_scroll = (ground_scroll - ground_speed) % 40
             for x in range(-40 + ground_scroll, SCREEN_WIDTH, 40):
@@ -603,10 +797,14 @@ def main():
                 pygame.draw.line(screen, (NEON_BLUE[0], NEON_BLUE[1], NEON_BLUE[2], 30), 
                                 (x, GROUND_HEIGHT), (x, SCREEN_HEIGHT), 1)
             
+            phase_timer.mark("ground")
+            
             # Update and draw dino
             dino.update(user_input)
             dino.draw(screen)
             
+            phase_timer.mark("dino")
+            
             # Update and draw obstacles
             for obstacle in list(obstacles):
                 obstacle.update()
@@ -617,8 +815,17 @@ def main():
                     # Play collision sound
                     if collision_sound:
                         collision_sound.play()
+                    phase_timer.event("collision", type(obstacle).__name__)
                     game_over = True
+            phase_timer.mark("obstacles")
         else:
+            # Attract mode restarts on its own after a short pause
+            if pilot:
+                game_over_frames += 1
+                if game_over_frames >= autopilot.RESTART_FRAMES or idle.timed_out:
+                    game_over_frames = 0
+                    reset_game()
+            
             # Game over screen
             game_over_surf = pygame.Surface((400, 100), pygame.SRCALPHA)
             game_over_surf.fill((0, 0, 0, 150))
@@ -645,9 +852,17 @@ def main():
         screen.blit(score_text, (20, 15))
         screen.blit(high_score_text, (20, 35))
         
+        phase_timer.mark("hud")
+        phase_timer.draw(screen)  # F3 overlay
+        
         # Update display
         pygame.display.update()
-        clock.tick(30)
+        phase_timer.mark("display")
+        startup_profile.frame_shown()
+        if options.profile_startup and startup_profile.pending and audio_service.done():
+            startup_profile.report()
+        gc_pacer.tick(clock, 30, idle=game_over)
+        phase_timer.mark("tick")
 
 if __name__ == "__main__":
-    main()
+    main(game_options.parse_args())
@@ -1,13 +1,32 @@
 #!/usr/bin/env python3
 import pygame
 import random
-import sys
-import os
-import math  # Import the standard math module
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()  # Initialize the mixer for sound
+import audio
+import autopilot
+import dino_physics
+import draw_counter
+import fonts
+import frame_profiler
+import game_options
+import game_state
+import gc_pacing
+import idle_screen
+import metrics_server
+import music
+import nebula
+import quality_governor
+import quit_steps
+import rewind
+import sampler
+import sprites
+import startup
+import title_screen
+import trace_export
+import watchdog
+
+# Started at import so the time to first frame includes module loading
+startup_profile = startup.StartupProfiler()
 
 # Constants
 SCREEN_WIDTH = 800
@@ -34,71 +53,18 @@ GROUND_COLOR = (80, 80, 100)  # Alien ground color
 score = 0
 game_speed = 15  # Increased base game speed
 high_score = 0
+session = None  # Snapshot/restore handles while main() runs
 
-# Create screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Space T-Rex Runner")
-clock = pygame.time.Clock()
-
-# Load font
-font = pygame.font.SysFont("Arial", 20)
-
-# Sound variables
-jump_sound = None
-collision_sound = None
-point_sound = None
-
-# Create sound files
-def create_sound_files():
-    global jump_sound, collision_sound, point_sound
-    
-    # Create a simple jump sound
-    sample_rate = 44100
-    duration = 0.2  # seconds
-    frequency = 800  # Hz
-    
-    # Generate a simple sine wave for jump sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        value = int(127 * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    jump_sound = pygame.mixer.Sound(buffer=bytes(buf))
-    
-    # Create a simple collision sound (lower tone)
-    duration = 0.3  # seconds
-    frequency = 200  # Hz
-    
-    # Generate a simple sine wave with decay for collision sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        decay = 1 - (t / duration)
-        value = int(127 * decay * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    collision_sound = pygame.mixer.Sound(buffer=bytes(buf))
-    
-    # Create a simple point sound (high beep)
-    duration = 0.1  # seconds
-    frequency = 1200  # Hz
-    
-    # Generate a simple sine wave for point sound
-    buf = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        value = int(127 * (0.5 + 0.5 * math.sin(2 * math.pi * frequency * t)))
-        buf.append(value)
-    
-    point_sound = pygame.mixer.Sound(buffer=bytes(buf))
+# Window, clock and fonts are created by start() so importing stays cheap
+screen = None
+clock = None
+font = None
 
-# Try to create sound files
-try:
-    create_sound_files()
-    print("Sound effects created successfully!")
-except Exception as e:
-    print(f"Could not create sound files: {e}. Game will run without sound.")
+# Sound effects: silent proxies until audio_service has opened the mixer
+audio_service = audio.AudioService()
+jump_sound = audio_service.sound("jump")
+collision_sound = audio_service.sound("collision")
+point_sound = audio_service.sound("point")
 
 # Helper function to draw pixelated shapes
 def draw_pixel_rect(surface, color, rect, pixel_size=2):
@@ -115,6 +81,17 @@ def draw_pixel_circle(surface, color, center, radius, pixel_size=2):
             if (x - x0)**2 + (y - y0)**2 <= radius**2:
                 pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
 
+# Effect detail per quality level, full detail first.  With --quality auto
+# the governor steps down this list while frames run over budget and back
+# up when there is headroom again (see quality_governor.py)
+QUALITY_LEVELS = [
+    {"twinkle": True, "stars": 100, "planet_pixel": 3, "nebulae": None},  # None: uncapped
+    {"twinkle": False, "stars": 100, "planet_pixel": 3, "nebulae": 6},
+    {"twinkle": False, "stars": 60, "planet_pixel": 4, "nebulae": 3},
+    {"twinkle": False, "stars": 30, "planet_pixel": 6, "nebulae": 1},
+]
+quality = quality_governor.QualityGovernor(QUALITY_LEVELS)
+
 # Create stars for space background
 stars = []
 for _ in range(100):  # More stars for space theme
@@ -138,79 +115,95 @@ for _ in range(3):
 
 class TRex:
     def __init__(self):
-        # Create a pixelated T-Rex shape
-        self.width = 50
-        self.height = 60
+        # Frames are drawn once by draw_frames() and shared through the sprite cache
+        frames = sprite_set.get("trex")
+        self.run_imgs = list(frames[:2])
+        self.jump_img = frames[2]
+        self.duck_img = frames[3]
+        self.width, self.height = self.run_imgs[0].get_size()
         self.x = 80
         self.y = GROUND_HEIGHT - self.height
         self.jump_vel = 8.5
         self.is_jumping = False
         self.is_ducking = False
-        self.vel_y = 0
+        self.jump_frame = 0  # Frames since takeoff
         self.step_index = 0
-        self.pixel_size = 2  # Size of each "pixel" for the pixelated look
+        
+        self.image = self.run_imgs[0]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x
+        self.rect.y = self.y
+        
+        # Jump arc and per-frame hitboxes are computed once per jump_vel
+        self.jump_arc = dino_physics.jump_arc(self.jump_vel)
+        self.jump_hitboxes = dino_physics.jump_hitboxes(self.x, self.y, self.width, self.height, self.jump_arc)
+        
+    @staticmethod
+    def draw_frames():
+        """Return the two run frames, the jump frame and the duck frame"""
+        # Create a pixelated T-Rex shape
+        width = 50
+        height = 60
+        pixel_size = 2  # Size of each "pixel" for the pixelated look
         
         # Create pixelated T-Rex images for animation
-        self.run_imgs = []
+        run_imgs = []
         for i in range(2):
-            img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            img = pygame.Surface((width, height), pygame.SRCALPHA)
             
             # T-Rex body (main body block)
-            draw_pixel_rect(img, DINO_GREEN, (5, 10, 30, 30), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (5, 10, 30, 30), pixel_size)
             
             # T-Rex head (larger for T-Rex)
-            draw_pixel_rect(img, DINO_GREEN, (25, 0, 20, 20), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (25, 0, 20, 20), pixel_size)
             
             # T-Rex tail
-            draw_pixel_rect(img, DINO_GREEN, (0, 15, 15, 10), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (0, 15, 15, 10), pixel_size)
             
             # T-Rex arms (tiny arms)
-            draw_pixel_rect(img, DINO_GREEN, (25, 25, 8, 5), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (25, 25, 8, 5), pixel_size)
             
             # T-Rex legs
             leg_height = 20 if i == 0 else 15
             leg_offset = 0 if i == 0 else 5
             # Back leg
-            draw_pixel_rect(img, DINO_GREEN, (10, self.height - leg_height, 8, leg_height), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (10, height - leg_height, 8, leg_height), pixel_size)
             # Front leg
-            draw_pixel_rect(img, DINO_GREEN, (30, self.height - leg_height - leg_offset, 8, leg_height + leg_offset), self.pixel_size)
+            draw_pixel_rect(img, DINO_GREEN, (30, height - leg_height - leg_offset, 8, leg_height + leg_offset), pixel_size)
             
             # T-Rex eye
-            draw_pixel_rect(img, WHITE, (35, 5, 4, 4), self.pixel_size)
-            draw_pixel_rect(img, BLACK, (36, 6, 2, 2), self.pixel_size)
+            draw_pixel_rect(img, WHITE, (35, 5, 4, 4), pixel_size)
+            draw_pixel_rect(img, BLACK, (36, 6, 2, 2), pixel_size)
             
             # T-Rex teeth (pixelated)
-            draw_pixel_rect(img, WHITE, (40, 15, 2, 2), self.pixel_size)
-            draw_pixel_rect(img, WHITE, (43, 15, 2, 2), self.pixel_size)
+            draw_pixel_rect(img, WHITE, (40, 15, 2, 2), pixel_size)
+            draw_pixel_rect(img, WHITE, (43, 15, 2, 2), pixel_size)
             
-            self.run_imgs.append(img)
+            run_imgs.append(img)
             
         # Jump image
-        self.jump_img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        jump_img = pygame.Surface((width, height), pygame.SRCALPHA)
         # Copy the first run image but adjust the legs
-        self.jump_img.blit(self.run_imgs[0], (0, 0))
+        jump_img.blit(run_imgs[0], (0, 0))
         # Clear the leg area
-        pygame.draw.rect(self.jump_img, (0, 0, 0, 0), (5, self.height-25, 40, 25))
+        pygame.draw.rect(jump_img, (0, 0, 0, 0), (5, height-25, 40, 25))
         # Draw tucked legs
-        draw_pixel_rect(self.jump_img, DINO_GREEN, (10, self.height - 10, 25, 10), self.pixel_size)
+        draw_pixel_rect(jump_img, DINO_GREEN, (10, height - 10, 25, 10), pixel_size)
         
         # Duck image (shorter and longer)
-        self.duck_img = pygame.Surface((self.width + 10, self.height - 20), pygame.SRCALPHA)
+        duck_img = pygame.Surface((width + 10, height - 20), pygame.SRCALPHA)
         # Stretched body
-        draw_pixel_rect(self.duck_img, DINO_GREEN, (0, 10, 40, 20), self.pixel_size)
+        draw_pixel_rect(duck_img, DINO_GREEN, (0, 10, 40, 20), pixel_size)
         # Head
-        draw_pixel_rect(self.duck_img, DINO_GREEN, (30, 0, 20, 15), self.pixel_size)
+        draw_pixel_rect(duck_img, DINO_GREEN, (30, 0, 20, 15), pixel_size)
         # Eye
-        draw_pixel_rect(self.duck_img, WHITE, (40, 5, 4, 4), self.pixel_size)
-        draw_pixel_rect(self.duck_img, BLACK, (41, 6, 2, 2), self.pixel_size)
+        draw_pixel_rect(duck_img, WHITE, (40, 5, 4, 4), pixel_size)
+        draw_pixel_rect(duck_img, BLACK, (41, 6, 2, 2), pixel_size)
         # Legs
-        draw_pixel_rect(self.duck_img, DINO_GREEN, (10, self.height - 30, 8, 10), self.pixel_size)
-        draw_pixel_rect(self.duck_img, DINO_GREEN, (25, self.height - 30, 8, 10), self.pixel_size)
+        draw_pixel_rect(duck_img, DINO_GREEN, (10, height - 30, 8, 10), pixel_size)
+        draw_pixel_rect(duck_img, DINO_GREEN, (25, height - 30, 8, 10), pixel_size)
         
-        self.image = self.run_imgs[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
+        return run_imgs[0], run_imgs[1], jump_img, duck_img
         
     def update(self, user_input):
         if self.is_jumping:
@@ -237,20 +230,29 @@ class TRex:
             
     def jump(self):
         self.image = self.jump_img
-        if self.is_jumping:
-            self.rect.y -= self.vel_y * 4
-            self.vel_y -= 0.8
+        # Look up this frame of the precomputed jump arc
+        self.jump_frame += 1
+        self.rect.update(self.jump_hitboxes[self.jump_frame])
             
-        if self.vel_y < -self.jump_vel:
+        if self.jump_frame >= len(self.jump_arc) - 1:
             self.is_jumping = False
-            self.vel_y = self.jump_vel
-            self.rect.y = self.y
+            self.jump_frame = 0
+            
+    def predict_rect(self, frames_ahead):
+        """Return the hitbox frames_ahead frames from now if no key is pressed"""
+        if self.is_jumping:
+            frame = self.jump_frame + frames_ahead
+            if frame < len(self.jump_arc):
+                return pygame.Rect(self.jump_hitboxes[frame])
+        if self.is_ducking:
+            return self.duck_img.get_rect(topleft=(self.x, self.y + dino_physics.DUCK_OFFSET))
+        return self.run_imgs[0].get_rect(topleft=(self.x, self.y))
             
     def duck(self):
         self.image = self.duck_img
         self.rect = self.image.get_rect()
         self.rect.x = self.x
-        self.rect.y = self.y + 20  # Adjust y position when ducking
+        self.rect.y = self.y + dino_physics.DUCK_OFFSET  # Adjust y position when ducking
         self.step_index += 1
             
     def run(self):
@@ -286,99 +288,112 @@ class Obstacle:
 class SpaceRock(Obstacle):
     def __init__(self, image=None):
         self.type = random.randint(0, 2)
-        self.pixel_size = 2  # Size of each "pixel" for pixelated look
+        self.image = sprite_set.get(f"rock.{self.type}")[0]  # Drawn once per type by draw_frames()
+        
+        super().__init__(self.image, self.type)
+        self.rect.y = GROUND_HEIGHT - self.rect.height
+        
+        # Smaller rocks move faster
+        if self.type == 0:  # Small asteroid
+            self.speed_multiplier = random.uniform(1.3, 1.7)  # Faster
+        elif self.type == 1:  # Medium asteroid
+            self.speed_multiplier = random.uniform(1.1, 1.4)  # Medium speed
+        else:  # Large asteroid
+            self.speed_multiplier = random.uniform(0.9, 1.2)  # Slower
+        
+    @staticmethod
+    def draw_frames(kind):
+        """Return the single frame of a space rock of the given type"""
+        pixel_size = 2  # Size of each "pixel" for pixelated look
         
         # Create pixelated asteroid/space rock images
-        if self.type == 0:
+        if kind == 0:
             # Small asteroid
             width, height = 25, 25
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Main rock
-            draw_pixel_circle(self.image, (150, 150, 150), (width//2, height//2), width//2 - 2, self.pixel_size)
+            draw_pixel_circle(image, (150, 150, 150), (width//2, height//2), width//2 - 2, pixel_size)
             # Craters
-            draw_pixel_circle(self.image, (100, 100, 100), (width//4, height//4), 3, self.pixel_size)
-            draw_pixel_circle(self.image, (100, 100, 100), (3*width//4, 3*height//4), 2, self.pixel_size)
-        elif self.type == 1:
+            draw_pixel_circle(image, (100, 100, 100), (width//4, height//4), 3, pixel_size)
+            draw_pixel_circle(image, (100, 100, 100), (3*width//4, 3*height//4), 2, pixel_size)
+        elif kind == 1:
             # Medium asteroid
             width, height = 40, 40
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Main rock (slightly irregular)
-            draw_pixel_circle(self.image, (130, 130, 130), (width//2, height//2), width//2 - 4, self.pixel_size)
-            draw_pixel_rect(self.image, (130, 130, 130), (width//4, height//4, width//2, height//2), self.pixel_size)
+            draw_pixel_circle(image, (130, 130, 130), (width//2, height//2), width//2 - 4, pixel_size)
+            draw_pixel_rect(image, (130, 130, 130), (width//4, height//4, width//2, height//2), pixel_size)
             # Craters
-            draw_pixel_circle(self.image, (80, 80, 80), (width//3, height//3), 4, self.pixel_size)
-            draw_pixel_circle(self.image, (80, 80, 80), (2*width//3, 2*height//3), 5, self.pixel_size)
-            draw_pixel_circle(self.image, (80, 80, 80), (width//4, 2*height//3), 3, self.pixel_size)
+            draw_pixel_circle(image, (80, 80, 80), (width//3, height//3), 4, pixel_size)
+            draw_pixel_circle(image, (80, 80, 80), (2*width//3, 2*height//3), 5, pixel_size)
+            draw_pixel_circle(image, (80, 80, 80), (width//4, 2*height//3), 3, pixel_size)
         else:
             # Large asteroid
             width, height = 60, 60
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
             # Main rock (irregular shape)
-            draw_pixel_circle(self.image, (120, 120, 120), (width//2, height//2), width//2 - 5, self.pixel_size)
-            draw_pixel_rect(self.image, (120, 120, 120), (width//5, height//5, 3*width//5, 3*height//5), self.pixel_size)
+            draw_pixel_circle(image, (120, 120, 120), (width//2, height//2), width//2 - 5, pixel_size)
+            draw_pixel_rect(image, (120, 120, 120), (width//5, height//5, 3*width//5, 3*height//5), pixel_size)
             # Craters
             for _ in range(5):
                 x = random.randint(width//4, 3*width//4)
                 y = random.randint(height//4, 3*height//4)
                 size = random.randint(2, 6)
-                draw_pixel_circle(self.image, (70, 70, 70), (x, y), size, self.pixel_size)
-            
-        super().__init__(self.image, self.type)
-        self.rect.y = GROUND_HEIGHT - height
+                draw_pixel_circle(image, (70, 70, 70), (x, y), size, pixel_size)
         
-        # Smaller rocks move faster
-        if self.type == 0:  # Small asteroid
-            self.speed_multiplier = random.uniform(1.3, 1.7)  # Faster
-        elif self.type == 1:  # Medium asteroid
-            self.speed_multiplier = random.uniform(1.1, 1.4)  # Medium speed
-        else:  # Large asteroid
-            self.speed_multiplier = random.uniform(0.9, 1.2)  # Slower
+        return (image,)
 
 class AlienShip(Obstacle):
     def __init__(self):
         self.type = 0
-        self.pixel_size = 2  # Size of each "pixel" for pixelated look
+        self.images = list(sprite_set.get("ship"))  # Drawn once by draw_frames()
+        self.image = self.images[0]
+        self.index = 0
+        
+        # Random height for the ship
+        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
+        self.height = random.choice(height_options)
+        
+        super().__init__(self.image, self.type)
+        self.rect.y = self.height
+        
+        # Alien ships have erratic speeds
+        self.speed_multiplier = random.uniform(1.2, 1.8)  # Generally faster
+        self.direction_change_timer = 0
+        self.vertical_speed = random.choice([-1, 0, 1])  # Can move up/down slightly
+        
+    @staticmethod
+    def draw_frames():
+        """Return the two light-pattern frames"""
+        pixel_size = 2  # Size of each "pixel" for pixelated look
         
         # Create pixelated alien ship images for animation
-        self.images = []
+        images = []
         for i in range(2):
             # Ship with different light patterns
             width, height = 50, 25
             img = pygame.Surface((width, height), pygame.SRCALPHA)
             
             # Ship body (saucer shape)
-            draw_pixel_rect(img, (150, 150, 150), (10, 10, 30, 10), self.pixel_size)
-            draw_pixel_circle(img, (150, 150, 150), (width//2, height//2), 15, self.pixel_size)
+            draw_pixel_rect(img, (150, 150, 150), (10, 10, 30, 10), pixel_size)
+            draw_pixel_circle(img, (150, 150, 150), (width//2, height//2), 15, pixel_size)
             
             # Cockpit dome
-            draw_pixel_circle(img, (100, 200, 255), (width//2, height//2 - 5), 8, self.pixel_size)
+            draw_pixel_circle(img, (100, 200, 255), (width//2, height//2 - 5), 8, pixel_size)
             
             # Lights (alternating)
             light_colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
             for j in range(3):
                 if (i + j) % 2 == 0:
-                    draw_pixel_circle(img, light_colors[j], (15 + j*10, height - 5), 2, self.pixel_size)
+                    draw_pixel_circle(img, light_colors[j], (15 + j*10, height - 5), 2, pixel_size)
             
             # Bottom glow
             glow_color = (200, 200, 100) if i == 0 else (100, 200, 200)
-            draw_pixel_rect(img, glow_color, (20, height - 3, 10, 3), self.pixel_size)
+            draw_pixel_rect(img, glow_color, (20, height - 3, 10, 3), pixel_size)
             
-            self.images.append(img)
-            
-        self.image = self.images[0]
-        self.index = 0
-        
-        # Random height for the ship
-        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
-        self.height = random.choice(height_options)
-        
-        super().__init__(self.image, self.type)
-        self.rect.y = self.height
+            images.append(img)
         
-        # Alien ships have erratic speeds
-        self.speed_multiplier = random.uniform(1.2, 1.8)  # Generally faster
-        self.direction_change_timer = 0
-        self.vertical_speed = random.choice([-1, 0, 1])  # Can move up/down slightly
+        return tuple(images)
         
     def update(self):
         # Ship animation
@@ -406,50 +421,12 @@ class AlienShip(Obstacle):
 
 class SpaceCloud:
     def __init__(self):
-        self.width = random.randint(60, 120)
-        self.height = random.randint(30, 50)
+        # One of the pre-drawn nebulae of a random color (see nebula.py)
+        self.image = sprite_set.get(f"nebula.{random.randrange(len(nebula.COLORS))}")[0]
+        self.width, self.height = self.image.get_size()
         self.x = SCREEN_WIDTH
         self.y = random.randint(50, 200)
         self.speed = random.randint(2, 5)  # Faster clouds
-        self.pixel_size = 3  # Size of each "pixel" for pixelated look
-        
-        # Create a pixelated nebula/gas cloud
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Choose a random nebula color
-        nebula_colors = [
-            (255, 100, 100, 50),  # Red nebula
-            (100, 100, 255, 50),  # Blue nebula
-            (255, 100, 255, 50),  # Purple nebula
-            (100, 255, 100, 50),  # Green nebula
-        ]
-        nebula_color = random.choice(nebula_colors)
-        
-        # Draw nebula in a pixelated style
-        cloud_points = [
-            (self.width // 4, self.height // 2),
-            (self.width // 2, self.height // 3),
-            (3 * self.width // 4, self.height // 2)
-        ]
-        
-        for center_x, center_y in cloud_points:
-            radius = random.randint(self.height // 3, self.height // 2)
-            for x in range(center_x - radius, center_x + radius, self.pixel_size):
-                for y in range(center_y - radius, center_y + radius, self.pixel_size):
-                    if (x - center_x)**2 + (y - center_y)**2 <= radius**2:
-                        # Add some randomness to the nebula
-                        if random.random() > 0.3:  # 70% chance to draw a pixel
-                            alpha = random.randint(20, nebula_color[3])
-                            color = (nebula_color[0], nebula_color[1], nebula_color[2], alpha)
-                            pygame.draw.rect(self.image, color, 
-                                            (x - center_x + radius, y - center_y + radius, 
-                                             self.pixel_size, self.pixel_size))
-        
-        # Add some stars inside the nebula
-        for _ in range(5):
-            x = random.randint(0, self.width - self.pixel_size)
-            y = random.randint(0, self.height - self.pixel_size)
-            pygame.draw.rect(self.image, WHITE, (x, y, self.pixel_size, self.pixel_size))
         
     def update(self):
         self.x -= self.speed
@@ -459,11 +436,57 @@ class SpaceCloud:
     def draw(self, screen):
         screen.blit(self.image, (self.x, self.y))
 
-def main():
-    global game_speed, score, obstacles, clouds, high_score, stars, planets
+# Every sprite this variant draws.  Each one is drawn on first use, or sliced
+# from the compiled atlas (python build_assets.py) when that is up to date.
+sprite_set = sprites.SpriteSet(__file__, nebula.__file__)
+sprite_set.add("trex", TRex.draw_frames)
+sprite_set.add("rock.0", lambda: SpaceRock.draw_frames(0))
+sprite_set.add("rock.1", lambda: SpaceRock.draw_frames(1))
+sprite_set.add("rock.2", lambda: SpaceRock.draw_frames(2), variants=sprites.RANDOM_VARIANTS)  # Random craters
+sprite_set.add("ship", AlienShip.draw_frames)
+for color in range(len(nebula.COLORS)):
+    sprite_set.add(f"nebula.{color}", lambda color=color: (nebula.draw(nebula.COLORS[color]),),
+                   variants=nebula.VARIANTS_PER_COLOR)
+
+
+def start():
+    """Initialize pygame and create the window, clock and fonts; safe to call again"""
+    global screen, clock, font
+    if screen is not None:
+        return
+    with startup_profile.phase("pygame init"):
+        # The mixer is opened in the background by audio_service
+        audio.init_pygame()
+    with startup_profile.phase("display"):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Space T-Rex Runner")
+        clock = pygame.time.Clock()
+    with startup_profile.phase("font lookup"):
+        font = fonts.load("Arial", 20)  # Resolved once and cached; falls back to pygame's bundled font
+    with startup_profile.phase("atlas load"):
+        sprite_set.load_atlas()
+
+
+def main(options=None):
+    global game_speed, score, obstacles, clouds, high_score, stars, planets, session, screen
+    if options is None:
+        options = game_options.parse_args([])
+    start()
+    on_quit = quit_steps.QuitSteps()  # Reports and cleanups for exit, in order
+    audio_service.start(options.audio_buffer, startup_profile)  # Opens the mixer without delaying the first frame
+    soundtrack = music.MusicStream(audio_service).start() if options.music else None
+    on_quit.add(soundtrack and soundtrack.stop)
+    on_quit.add(options.audio_stats and audio_service.report)
+    
+    # Title screen while every sprite is drawn in the background, so play
+    # never starts with a cold cache
+    if not title_screen.show(screen, clock, font, sprite_set, WHITE, SPACE_BG,
+                             autostart=options.autopilot, profiler=startup_profile):
+        on_quit.run()
     
     # Create game objects
-    dino = TRex()
+    with startup_profile.phase("sprite generation"):
+        dino = TRex()
     obstacles = []
     clouds = []
     
@@ -474,6 +497,50 @@ def main():
     cloud_timer = 0
     point_milestone = 100  # For playing point sound every 100 points
     
+    # Autopilot plays with synthetic input when enabled (attract mode)
+    pilot = autopilot.Autopilot(options.autopilot_budget_ms) if options.autopilot else None
+    on_quit.add(pilot and pilot.report)
+    # Per-phase timings and overlay (F3); free while switched off.  --trace
+    # streams the same timings plus spawns, collisions and sounds to a file
+    tracer = trace_export.TraceWriter(options.trace) if options.trace else None
+    on_quit.add(tracer and tracer.close)
+    # Draw-call and surface allocation counters (--draw-stats) wrap the screen
+    draw_stats = draw_counter.DrawCounter().install() if options.draw_stats else None
+    on_quit.add(draw_stats and draw_stats.report)
+    if draw_stats:
+        screen = draw_stats.wrap(screen)
+    # Live counts and score for the watchdog log and the metrics endpoint
+    def live_entities():
+        return {"obstacles": len(obstacles), "clouds": len(clouds)}
+    def score_stats():
+        return {"score": score, "high_score": high_score, "game_speed": game_speed, "game_over": int(game_over),
+                "quality_level": quality.level}
+    # Frames over --watchdog-ms get their phases, entity counts and stack logged
+    frame_watchdog = watchdog.FrameWatchdog(options.watchdog_ms, counts=live_entities) if options.watchdog_ms else None
+    on_quit.add(frame_watchdog and frame_watchdog.close)
+    # Effects step down while frames run over budget (--quality)
+    quality.set_mode(options.quality)
+    governed = options.quality == "auto"  # A pinned level needs no frame timings
+    # Prometheus text format on --metrics-port for remote monitoring
+    metrics = None
+    if options.metrics_port is not None:
+        metrics = metrics_server.MetricsServer(options.metrics_port, options.metrics_host, entities=live_entities,
+                                               gauges=score_stats, caches={"sprites": sprite_set, "text": font})
+    on_quit.add(metrics and metrics.close)
+    phase_timer = frame_profiler.FrameProfiler(options.frame_profile, tracer=tracer, counters=draw_stats,
+                                               listeners=(frame_watchdog, metrics, governed and quality))
+    # --gc-pacing freezes startup objects and collects in spare frame time only
+    gc_pacer = gc_pacing.GCPacer(options.gc_pacing, profiler=phase_timer)
+    on_quit.add(options.gc_pacing and gc_pacer.report)
+    # Game-over and pause screens sleep until a key; attract mode wakes up to restart
+    idle = idle_screen.IdleScreen(phase_timer, wake_ms=autopilot.RESTART_FRAMES * 1000 // 30 if pilot else None)
+    paused = False
+    # Flamegraph-ready stack samples of the loop until exit (--profile-sample)
+    stack_sampler = sampler.StackSampler().start() if options.profile_sample else None
+    on_quit.add(stack_sampler and stack_sampler.write, options.profile_sample)
+    audio_service.events = phase_timer.event
+    game_over_frames = 0
+    
     # Speed increase variables
     speed_increase_rate = 0.2  # How much to increase speed per 100 points
     max_game_speed = 30  # Cap the maximum speed
@@ -493,32 +560,93 @@ def main():
         dino.rect.y = dino.y
         dino.is_jumping = False
         dino.is_ducking = False
-        dino.vel_y = dino.jump_vel
+        dino.jump_frame = 0
+        rewinder.clear()
+    
+    def snapshot(full=True):
+        """Capture the session as an immutable GameSnapshot
+
+        full=False skips scenery and RNG state for cheap per-frame captures.
+        """
+        return game_state.capture(dino, obstacles, clouds, score, game_speed, high_score,
+                                  (game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames),
+                                  (stars, planets) if full else (), rng=full)
+    
+    def restore(snap):
+        """Return the session to an earlier snapshot"""
+        nonlocal game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames
+        global game_speed, score, obstacles, clouds, high_score
+        obstacles, clouds = game_state.restore_entities(snap, (stars, planets))
+        game_speed, score = snap.game_speed, snap.score
+        high_score = max(high_score, snap.high_score)  # A rewind never takes back a record
+        game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames = snap.timers
+    
+    session = game_state.Session(snapshot, restore)
+    quick_save = None
+    rewinder = rewind.RewindBuffer()
     
     while run:
-        for event in pygame.event.get():
+        events = idle.events(game_over, paused)  # Blocks while the idle screen is up
+        phase_timer.frame()  # Closes the previous frame's phase timings
+        if draw_stats:
+            draw_stats.next_frame()
+        audio_service.next_frame()  # Repeated sound triggers within one frame play once
+        if soundtrack:
+            soundtrack.set_speed(game_speed)  # Music tempo follows the game
+            soundtrack.set_paused(paused or game_over)  # Silent while the idle screen sleeps
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
-                pygame.quit()
-                sys.exit()
+                on_quit.run()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and game_over:
                     reset_game()
+                # Quick save / quick load of the whole session
+                if event.key == pygame.K_F5:
+                    quick_save = snapshot()
+                elif event.key == pygame.K_F9 and quick_save and not paused:
+                    # Not while paused: the loaded state couldn't be drawn without stepping it
+                    restore(quick_save)
+                elif event.key == pygame.K_F3:
+                    phase_timer.toggle()
+                elif event.key == idle_screen.PAUSE_KEY and not game_over:
+                    paused = not paused
+                    if soundtrack:
+                        soundtrack.set_paused(paused)
+                    if paused:
+                        idle_screen.draw_paused(screen, font, WHITE)
+        phase_timer.mark("events")
+        if paused:
+            continue  # Simulation halted; the captioned frame stays up
         
         # Get user input
         user_input = pygame.key.get_pressed()
+        rewind_held = user_input[pygame.K_LEFT]
+        if pilot:
+            user_input = pilot.decide(dino, obstacles, game_speed)
+        
+        # Hold LEFT to rewind the last few seconds, otherwise record this frame
+        if rewind_held and rewinder.frames:
+            restore(rewinder.rewind())
+        elif not game_over:
+            rewinder.push(snapshot(full=False))
+        
+        phase_timer.mark("input")
         
         # Draw space background
         screen.fill(SPACE_BG)
         
-        # Draw stars with twinkling effect
-        for star in stars:
-            # Twinkle effect - vary brightness
-            brightness = int(255 * (star[3] + random.random() * 0.2))
-            if brightness > 255:
-                brightness = 255
-            color = (brightness, brightness, brightness)
-            pygame.draw.rect(screen, color, (star[0], star[1], star[2], star[2]))
+        # Draw stars with twinkling effect; fewer of them drawn at lower quality
+        twinkle = quality.settings["twinkle"]
+        shown = quality.settings["stars"]  # All of them keep moving so none freeze while hidden
+        for index, star in enumerate(stars):
+            if index < shown:
+                # Twinkle effect - vary brightness
+                brightness = int(255 * (star[3] + random.random() * 0.2)) if twinkle else int(255 * star[3])
+                if brightness > 255:
+                    brightness = 255
+                color = (brightness, brightness, brightness)
+                pygame.draw.rect(screen, color, (star[0], star[1], star[2], star[2]))
             
             # Move stars for parallax effect
             star[0] -= star[2] // 2  # Smaller stars move slower
@@ -527,10 +655,11 @@ def main():
                 star[1] = random.randint(0, GROUND_HEIGHT - 20)
                 star[3] = random.random() * 0.5 + 0.5  # New brightness
         
-        # Draw planets
+        # Draw planets, in coarser blocks at lower quality
+        planet_pixel = quality.settings["planet_pixel"]
         for planet in planets:
             # Draw the planet
-            draw_pixel_circle(screen, planet[3], (planet[0], planet[1]), planet[2], 3)
+            draw_pixel_circle(screen, planet[3], (planet[0], planet[1]), planet[2], planet_pixel)
             
             # Move planets (slower than game objects)
             planet[0] -= planet[4]
@@ -541,6 +670,8 @@ def main():
                 planet[3] = random.choice(PLANET_COLORS)
                 planet[4] = random.randint(1, 3)
         
+        phase_timer.mark("background")
+        
         if not game_over:
             # Update game speed and score
             if score % 100 == 0 and score > 0:
@@ -567,19 +698,26 @@ def main():
                     obstacles.append(AlienShip())
                 else:  # 2/3 chance for space rock
                     obstacles.append(SpaceRock())
+                phase_timer.event("spawn", type(obstacles[-1]).__name__)
                 obstacle_timer = 0
                 
             # Generate space clouds/nebulae
             cloud_timer += 1
-            if cloud_timer >= random.randint(75, 150):
+            nebulae = quality.settings["nebulae"]
+            if cloud_timer >= random.randint(75, 150) and (nebulae is None or len(clouds) < nebulae):
                 clouds.append(SpaceCloud())
+                phase_timer.event("spawn", type(clouds[-1]).__name__)
                 cloud_timer = 0
             
+            phase_timer.mark("spawn")
+            
             # Update and draw clouds
             for cloud in list(clouds):
                 cloud.update()
                 cloud.draw(screen)
             
+            phase_timer.mark("clouds")
+            
             # Draw space ground (alien surface)
             for x in range(0, SCREEN_WIDTH, 4):  # 4-pixel blocks for ground
                 height = 2 if x % 8 == 0 else 1  # Vary height for texture
@@ -590,10 +728,14 @@ def main():
                 )
                 pygame.draw.rect(screen, color, (x, GROUND_HEIGHT, 4, height))
             
+            phase_timer.mark("ground")
+            
             # Update and draw dino
             dino.update(user_input)
             dino.draw(screen)
             
+            phase_timer.mark("dino")
+            
             # Update and draw obstacles
             for obstacle in list(obstacles):
                 obstacle.update()
@@ -604,8 +746,17 @@ def main():
                     # Play collision sound
                     if collision_sound:
                         collision_sound.play()
+                    phase_timer.event("collision", type(obstacle).__name__)
                     game_over = True
+            phase_timer.mark("obstacles")
         else:
+            # Attract mode restarts on its own after a short pause
+            if pilot:
+                game_over_frames += 1
+                if game_over_frames >= autopilot.RESTART_FRAMES or idle.timed_out:
+                    game_over_frames = 0
+                    reset_game()
+            
             # Game over screen
             game_over_surf = pygame.Surface((400, 100), pygame.SRCALPHA)
             game_over_surf.fill((0, 0, 0, 150))
@@ -622,9 +773,17 @@ def main():
         screen.blit(high_score_text, (10, 30))
         screen.blit(speed_text, (10, 50))
         
+        phase_timer.mark("hud")
+        phase_timer.draw(screen)  # F3 overlay
+        
         # Update display
         pygame.display.update()
-        clock.tick(30)
+        phase_timer.mark("display")
+        startup_profile.frame_shown()
+        if options.profile_startup and startup_profile.pending and audio_service.done():
+            startup_profile.report()
+        gc_pacer.tick(clock, 30, idle=game_over)
+        phase_timer.mark("tick")
 
 if __name__ == "__main__":
-    main()
+    main(game_options.parse_args())
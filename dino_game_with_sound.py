@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 import pygame
 import random
-import sys
-import os
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()  # Initialize the mixer for sound
+import audio
+import autopilot
+import dino_physics
+import draw_counter
+import fonts
+import frame_profiler
+import game_options
+import game_state
+import gc_pacing
+import idle_screen
+import metrics_server
+import music
+import quit_steps
+import rewind
+import sampler
+import sprites
+import startup
+import title_screen
+import trace_export
+import watchdog
+
+# Started at import so the time to first frame includes module loading
+startup_profile = startup.StartupProfiler()
 
 # Constants
 SCREEN_WIDTH = 800
@@ -20,136 +38,77 @@ GRAY = (100, 100, 100)
 score = 0
 game_speed = 10
 high_score = 0
+session = None  # Snapshot/restore handles while main() runs
 
-# Create screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Dino Runner")
-clock = pygame.time.Clock()
-
-# Load font
-font = pygame.font.SysFont("Arial", 20)
-
-# Create sound effects
-jump_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "jump.wav"))
-collision_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "collision.wav"))
-point_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "point.wav"))
+# Window, clock and fonts are created by start() so importing stays cheap
+screen = None
+clock = None
+font = None
 
-# Create the sound files if they don't exist
-def create_sound_files():
-    # Create a simple jump sound (beep)
-    if not os.path.exists(os.path.join(os.path.dirname(__file__), "jump.wav")):
-        pygame.mixer.Sound.play(pygame.mixer.Sound(buffer=bytes([128] * 4000)))
-        pygame.mixer.Sound.stop(pygame.mixer.Sound(buffer=bytes([128] * 4000)))
-        
-        # Create a simple jump sound
-        sample_rate = 44100
-        duration = 0.2  # seconds
-        frequency = 800  # Hz
-        
-        # Generate a simple sine wave
-        buf = []
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            value = int(127 * (0.5 + 0.5 * pygame.math.sin(2 * 3.14159 * frequency * t)))
-            buf.append(value)
-        
-        # Save the sound
-        pygame.mixer.Sound(buffer=bytes(buf)).save(os.path.join(os.path.dirname(__file__), "jump.wav"))
-    
-    # Create a simple collision sound (lower tone)
-    if not os.path.exists(os.path.join(os.path.dirname(__file__), "collision.wav")):
-        # Create a simple collision sound
-        sample_rate = 44100
-        duration = 0.3  # seconds
-        frequency = 200  # Hz
-        
-        # Generate a simple sine wave with decay
-        buf = []
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            decay = 1 - (t / duration)
-            value = int(127 * decay * (0.5 + 0.5 * pygame.math.sin(2 * 3.14159 * frequency * t)))
-            buf.append(value)
-        
-        # Save the sound
-        pygame.mixer.Sound(buffer=bytes(buf)).save(os.path.join(os.path.dirname(__file__), "collision.wav"))
-    
-    # Create a simple point sound (high beep)
-    if not os.path.exists(os.path.join(os.path.dirname(__file__), "point.wav")):
-        # Create a simple point sound
-        sample_rate = 44100
-        duration = 0.1  # seconds
-        frequency = 1200  # Hz
-        
-        # Generate a simple sine wave
-        buf = []
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            value = int(127 * (0.5 + 0.5 * pygame.math.sin(2 * 3.14159 * frequency * t)))
-            buf.append(value)
-        
-        # Save the sound
-        pygame.mixer.Sound(buffer=bytes(buf)).save(os.path.join(os.path.dirname(__file__), "point.wav"))
-
-# Try to create sound files
-try:
-    create_sound_files()
-except:
-    print("Could not create sound files. Game will run without sound.")
-
-# Load sound files
-try:
-    jump_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "jump.wav"))
-    collision_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "collision.wav"))
-    point_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), "point.wav"))
-except:
-    print("Could not load sound files. Game will run without sound.")
-    jump_sound = None
-    collision_sound = None
-    point_sound = None
+# Sound effects: silent proxies until audio_service has opened the mixer
+audio_service = audio.AudioService()
+jump_sound = audio_service.sound("jump")
+collision_sound = audio_service.sound("collision")
+point_sound = audio_service.sound("point")
 
 class Dino:
     def __init__(self):
-        # Create a simple dinosaur shape
-        self.width = 44
-        self.height = 48
+        # Frames are drawn once by draw_frames() and shared through the sprite cache
+        frames = sprite_set.get("dino")
+        self.run_imgs = list(frames[:2])
+        self.jump_img = frames[2]
+        self.duck_img = frames[3]
+        self.width, self.height = self.run_imgs[0].get_size()
         self.x = 80
         self.y = GROUND_HEIGHT - self.height
         self.jump_vel = 8.5
         self.is_jumping = False
         self.is_ducking = False
-        self.vel_y = 0
+        self.jump_frame = 0  # Frames since takeoff
         self.step_index = 0
-        self.color = (50, 50, 50)  # Dark gray for dino
+        
+        self.image = self.run_imgs[0]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x
+        self.rect.y = self.y
+        
+        # Jump arc and per-frame hitboxes are computed once per jump_vel
+        self.jump_arc = dino_physics.jump_arc(self.jump_vel)
+        self.jump_hitboxes = dino_physics.jump_hitboxes(self.x, self.y, self.width, self.height, self.jump_arc)
+        
+    @staticmethod
+    def draw_frames():
+        """Return the two run frames, the jump frame and the duck frame"""
+        # Create a simple dinosaur shape
+        width = 44
+        height = 48
+        color = (50, 50, 50)  # Dark gray for dino
         
         # Create simple dino images for animation
-        self.run_imgs = []
+        run_imgs = []
         for i in range(2):
-            img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            pygame.draw.rect(img, self.color, (0, 0, self.width, self.height))
+            img = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(img, color, (0, 0, width, height))
             # Add leg detail
             leg_height = 10 if i == 0 else 15
-            pygame.draw.rect(img, BLACK, (self.width-15, self.height-leg_height, 10, leg_height))
-            self.run_imgs.append(img)
+            pygame.draw.rect(img, BLACK, (width-15, height-leg_height, 10, leg_height))
+            run_imgs.append(img)
             
         # Jump image
-        self.jump_img = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(self.jump_img, self.color, (0, 0, self.width, self.height))
-        pygame.draw.rect(self.jump_img, BLACK, (self.width-15, self.height-5, 10, 5))
+        jump_img = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(jump_img, color, (0, 0, width, height))
+        pygame.draw.rect(jump_img, BLACK, (width-15, height-5, 10, 5))
         
         # Duck image (shorter and longer)
-        self.duck_img = pygame.Surface((self.width+10, self.height-20), pygame.SRCALPHA)
-        pygame.draw.rect(self.duck_img, self.color, (0, 0, self.width+10, self.height-20))
+        duck_img = pygame.Surface((width+10, height-20), pygame.SRCALPHA)
+        pygame.draw.rect(duck_img, color, (0, 0, width+10, height-20))
         
         # Add eye
-        for img in self.run_imgs + [self.jump_img, self.duck_img]:
-            pygame.draw.circle(img, WHITE, (self.width-10, 15), 5)
-            pygame.draw.circle(img, BLACK, (self.width-10, 15), 2)
+        for img in run_imgs + [jump_img, duck_img]:
+            pygame.draw.circle(img, WHITE, (width-10, 15), 5)
+            pygame.draw.circle(img, BLACK, (width-10, 15), 2)
         
-        self.image = self.run_imgs[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x
-        self.rect.y = self.y
+        return run_imgs[0], run_imgs[1], jump_img, duck_img
         
     def update(self, user_input):
         if self.is_jumping:
@@ -176,20 +135,29 @@ class Dino:
             
     def jump(self):
         self.image = self.jump_img
-        if self.is_jumping:
-            self.rect.y -= self.vel_y * 4
-            self.vel_y -= 0.8
+        # Look up this frame of the precomputed jump arc
+        self.jump_frame += 1
+        self.rect.update(self.jump_hitboxes[self.jump_frame])
             
-        if self.vel_y < -self.jump_vel:
+        if self.jump_frame >= len(self.jump_arc) - 1:
             self.is_jumping = False
-            self.vel_y = self.jump_vel
-            self.rect.y = self.y
+            self.jump_frame = 0
+            
+    def predict_rect(self, frames_ahead):
+        """Return the hitbox frames_ahead frames from now if no key is pressed"""
+        if self.is_jumping:
+            frame = self.jump_frame + frames_ahead
+            if frame < len(self.jump_arc):
+                return pygame.Rect(self.jump_hitboxes[frame])
+        if self.is_ducking:
+            return self.duck_img.get_rect(topleft=(self.x, self.y + dino_physics.DUCK_OFFSET))
+        return self.run_imgs[0].get_rect(topleft=(self.x, self.y))
             
     def duck(self):
         self.image = self.duck_img
         self.rect = self.image.get_rect()
         self.rect.x = self.x
-        self.rect.y = self.y + 20  # Adjust y position when ducking
+        self.rect.y = self.y + dino_physics.DUCK_OFFSET  # Adjust y position when ducking
         self.step_index += 1
             
     def run(self):
@@ -220,38 +188,57 @@ class Obstacle:
 class Cactus(Obstacle):
     def __init__(self, image=None):
         self.type = random.randint(0, 2)
+        self.image = sprite_set.get(f"cactus.{self.type}")[0]  # Drawn once per type by draw_frames()
+        
+        super().__init__(self.image, self.type)
+        self.rect.y = GROUND_HEIGHT - self.rect.height
         
+    @staticmethod
+    def draw_frames(kind):
+        """Return the single frame of a cactus of the given type"""
         # Create simple cactus images
-        if self.type == 0:
+        if kind == 0:
             # Small cactus
             width, height = 20, 40
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (30, 100, 30), (0, 0, width, height))
-        elif self.type == 1:
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(image, (30, 100, 30), (0, 0, width, height))
+        elif kind == 1:
             # Medium cactus
             width, height = 30, 60
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (30, 100, 30), (0, 0, width, height))
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(image, (30, 100, 30), (0, 0, width, height))
         else:
             # Large cactus
             width, height = 40, 80
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (30, 100, 30), (0, 0, width, height))
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(image, (30, 100, 30), (0, 0, width, height))
             
         # Add some cactus details
-        if self.type > 0:  # Medium and large cacti have arms
+        if kind > 0:  # Medium and large cacti have arms
             arm_width = width // 2
-            pygame.draw.rect(self.image, (30, 100, 30), (width-5, height//3, arm_width, 10))
-            
-        super().__init__(self.image, self.type)
-        self.rect.y = GROUND_HEIGHT - height
+            pygame.draw.rect(image, (30, 100, 30), (width-5, height//3, arm_width, 10))
+        
+        return (image,)
 
 class Bird(Obstacle):
     def __init__(self):
         self.type = 0
+        self.images = list(sprite_set.get("bird"))  # Drawn once by draw_frames()
+        self.image = self.images[0]
+        self.index = 0
+        
+        # Random height for the bird
+        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
+        self.height = random.choice(height_options)
         
+        super().__init__(self.image, self.type)
+        self.rect.y = self.height
+        
+    @staticmethod
+    def draw_frames():
+        """Return the wings-up and wings-down frames"""
         # Create simple bird images for animation
-        self.images = []
+        images = []
         for i in range(2):
             # Bird with wings up or down
             width, height = 40, 30
@@ -267,17 +254,9 @@ class Bird(Obstacle):
             # Beak
             pygame.draw.polygon(img, (200, 150, 0), [(0, height//2), (10, height//2-5), (10, height//2+5)])
             
-            self.images.append(img)
-            
-        self.image = self.images[0]
-        self.index = 0
+            images.append(img)
         
-        # Random height for the bird
-        height_options = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
-        self.height = random.choice(height_options)
-        
-        super().__init__(self.image, self.type)
-        self.rect.y = self.height
+        return tuple(images)
         
     def update(self):
         # Bird animation
@@ -290,19 +269,28 @@ class Bird(Obstacle):
 
 class Cloud:
     def __init__(self):
-        self.width = random.randint(60, 120)
-        self.height = random.randint(30, 50)
+        # One of a few cloud shapes drawn by draw_frames() and kept in the sprite cache
+        self.image = sprite_set.get("cloud")[0]
+        self.width, self.height = self.image.get_size()
         self.x = SCREEN_WIDTH
         self.y = random.randint(50, 200)
         self.speed = random.randint(1, 3)
         
+    @staticmethod
+    def draw_frames():
+        """Return one randomly sized cloud"""
+        width = random.randint(60, 120)
+        height = random.randint(30, 50)
+        
         # Create a simple cloud image
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
         for i in range(3):  # Draw multiple circles for cloud puffs
-            radius = self.height // 2
-            center_x = self.width // 4 + (i * self.width // 4)
-            center_y = self.height // 2
-            pygame.draw.circle(self.image, WHITE, (center_x, center_y), radius)
+            radius = height // 2
+            center_x = width // 4 + (i * width // 4)
+            center_y = height // 2
+            pygame.draw.circle(image, WHITE, (center_x, center_y), radius)
+        
+        return (image,)
         
     def update(self):
         self.x -= self.speed
@@ -312,11 +300,55 @@ class Cloud:
     def draw(self, screen):
         screen.blit(self.image, (self.x, self.y))
 
-def main():
-    global game_speed, score, obstacles, clouds, high_score
+# Every sprite this variant draws.  Each one is drawn on first use, or sliced
+# from the compiled atlas (python build_assets.py) when that is up to date.
+sprite_set = sprites.SpriteSet(__file__)
+sprite_set.add("dino", Dino.draw_frames)
+sprite_set.add("cactus.0", lambda: Cactus.draw_frames(0))
+sprite_set.add("cactus.1", lambda: Cactus.draw_frames(1))
+sprite_set.add("cactus.2", lambda: Cactus.draw_frames(2))
+sprite_set.add("bird", Bird.draw_frames)
+sprite_set.add("cloud", Cloud.draw_frames, variants=sprites.RANDOM_VARIANTS)  # Random sizes
+
+
+def start():
+    """Initialize pygame and create the window, clock and fonts; safe to call again"""
+    global screen, clock, font
+    if screen is not None:
+        return
+    with startup_profile.phase("pygame init"):
+        # The mixer is opened in the background by audio_service
+        audio.init_pygame()
+    with startup_profile.phase("display"):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Dino Runner")
+        clock = pygame.time.Clock()
+    with startup_profile.phase("font lookup"):
+        font = fonts.load("Arial", 20)  # Resolved once and cached; falls back to pygame's bundled font
+    with startup_profile.phase("atlas load"):
+        sprite_set.load_atlas()
+
+
+def main(options=None):
+    global game_speed, score, obstacles, clouds, high_score, session, screen
+    if options is None:
+        options = game_options.parse_args([])
+    start()
+    on_quit = quit_steps.QuitSteps()  # Reports and cleanups for exit, in order
+    audio_service.start(options.audio_buffer, startup_profile)  # Opens the mixer without delaying the first frame
+    soundtrack = music.MusicStream(audio_service).start() if options.music else None
+    on_quit.add(soundtrack and soundtrack.stop)
+    on_quit.add(options.audio_stats and audio_service.report)
+    
+    # Title screen while every sprite is drawn in the background, so play
+    # never starts with a cold cache
+    if not title_screen.show(screen, clock, font, sprite_set, BLACK, WHITE,
+                             autostart=options.autopilot, profiler=startup_profile):
+        on_quit.run()
     
     # Create game objects
-    dino = Dino()
+    with startup_profile.phase("sprite generation"):
+        dino = Dino()
     obstacles = []
     clouds = []
     
@@ -327,6 +359,46 @@ def main():
     cloud_timer = 0
     point_milestone = 100  # For playing point sound every 100 points
     
+    # Autopilot plays with synthetic input when enabled (attract mode)
+    pilot = autopilot.Autopilot(options.autopilot_budget_ms) if options.autopilot else None
+    on_quit.add(pilot and pilot.report)
+    # Per-phase timings and overlay (F3); free while switched off.  --trace
+    # streams the same timings plus spawns, collisions and sounds to a file
+    tracer = trace_export.TraceWriter(options.trace) if options.trace else None
+    on_quit.add(tracer and tracer.close)
+    # Draw-call and surface allocation counters (--draw-stats) wrap the screen
+    draw_stats = draw_counter.DrawCounter().install() if options.draw_stats else None
+    on_quit.add(draw_stats and draw_stats.report)
+    if draw_stats:
+        screen = draw_stats.wrap(screen)
+    # Live counts and score for the watchdog log and the metrics endpoint
+    def live_entities():
+        return {"obstacles": len(obstacles), "clouds": len(clouds)}
+    def score_stats():
+        return {"score": score, "high_score": high_score, "game_speed": game_speed, "game_over": int(game_over)}
+    # Frames over --watchdog-ms get their phases, entity counts and stack logged
+    frame_watchdog = watchdog.FrameWatchdog(options.watchdog_ms, counts=live_entities) if options.watchdog_ms else None
+    on_quit.add(frame_watchdog and frame_watchdog.close)
+    # Prometheus text format on --metrics-port for remote monitoring
+    metrics = None
+    if options.metrics_port is not None:
+        metrics = metrics_server.MetricsServer(options.metrics_port, options.metrics_host, entities=live_entities,
+                                               gauges=score_stats, caches={"sprites": sprite_set, "text": font})
+    on_quit.add(metrics and metrics.close)
+    phase_timer = frame_profiler.FrameProfiler(options.frame_profile, tracer=tracer, counters=draw_stats,
+                                               listeners=(frame_watchdog, metrics))
+    # --gc-pacing freezes startup objects and collects in spare frame time only
+    gc_pacer = gc_pacing.GCPacer(options.gc_pacing, profiler=phase_timer)
+    on_quit.add(options.gc_pacing and gc_pacer.report)
+    # Game-over and pause screens sleep until a key; attract mode wakes up to restart
+    idle = idle_screen.IdleScreen(phase_timer, wake_ms=autopilot.RESTART_FRAMES * 1000 // 30 if pilot else None)
+    paused = False
+    # Flamegraph-ready stack samples of the loop until exit (--profile-sample)
+    stack_sampler = sampler.StackSampler().start() if options.profile_sample else None
+    on_quit.add(stack_sampler and stack_sampler.write, options.profile_sample)
+    audio_service.events = phase_timer.event
+    game_over_frames = 0
+    
     def reset_game():
         nonlocal game_over, obstacle_timer, cloud_timer, point_milestone
         global game_speed, score, obstacles, clouds
@@ -342,24 +414,83 @@ def main():
         dino.rect.y = dino.y
         dino.is_jumping = False
         dino.is_ducking = False
-        dino.vel_y = dino.jump_vel
+        dino.jump_frame = 0
+        rewinder.clear()
+    
+    def snapshot(full=True):
+        """Capture the session as an immutable GameSnapshot
+
+        full=False skips scenery and RNG state for cheap per-frame captures.
+        """
+        return game_state.capture(dino, obstacles, clouds, score, game_speed, high_score,
+                                  (game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames), rng=full)
+    
+    def restore(snap):
+        """Return the session to an earlier snapshot"""
+        nonlocal game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames
+        global game_speed, score, obstacles, clouds, high_score
+        obstacles, clouds = game_state.restore_entities(snap)
+        game_speed, score = snap.game_speed, snap.score
+        high_score = max(high_score, snap.high_score)  # A rewind never takes back a record
+        game_over, obstacle_timer, cloud_timer, point_milestone, game_over_frames = snap.timers
+    
+    session = game_state.Session(snapshot, restore)
+    quick_save = None
+    rewinder = rewind.RewindBuffer()
     
     while run:
-        for event in pygame.event.get():
+        events = idle.events(game_over, paused)  # Blocks while the idle screen is up
+        phase_timer.frame()  # Closes the previous frame's phase timings
+        if draw_stats:
+            draw_stats.next_frame()
+        audio_service.next_frame()  # Repeated sound triggers within one frame play once
+        if soundtrack:
+            soundtrack.set_speed(game_speed)  # Music tempo follows the game
+            soundtrack.set_paused(paused or game_over)  # Silent while the idle screen sleeps
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
-                pygame.quit()
-                sys.exit()
+                on_quit.run()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and game_over:
                     reset_game()
+                # Quick save / quick load of the whole session
+                if event.key == pygame.K_F5:
+                    quick_save = snapshot()
+                elif event.key == pygame.K_F9 and quick_save and not paused:
+                    # Not while paused: the loaded state couldn't be drawn without stepping it
+                    restore(quick_save)
+                elif event.key == pygame.K_F3:
+                    phase_timer.toggle()
+                elif event.key == idle_screen.PAUSE_KEY and not game_over:
+                    paused = not paused
+                    if soundtrack:
+                        soundtrack.set_paused(paused)
+                    if paused:
+                        idle_screen.draw_paused(screen, font, BLACK)
+        phase_timer.mark("events")
+        if paused:
+            continue  # Simulation halted; the captioned frame stays up
         
         # Get user input
         user_input = pygame.key.get_pressed()
+        rewind_held = user_input[pygame.K_LEFT]
+        if pilot:
+            user_input = pilot.decide(dino, obstacles, game_speed)
+        
+        # Hold LEFT to rewind the last few seconds, otherwise record this frame
+        if rewind_held and rewinder.frames:
+            restore(rewinder.rewind())
+        elif not game_over:
+            rewinder.push(snapshot(full=False))
+        
+        phase_timer.mark("input")
         
         # Draw background
         screen.fill(WHITE)
         
+        phase_timer.mark("background")
+        
         if not game_over:
             # Update game speed and score
             if score % 100 == 0 and score > 0:
@@ -383,26 +514,36 @@ def main():
                     obstacles.append(Bird())
                 else:  # 2/3 chance for cactus
                     obstacles.append(Cactus())
+                phase_timer.event("spawn", type(obstacles[-1]).__name__)
                 obstacle_timer = 0
                 
             # Generate clouds
             cloud_timer += 1
             if cloud_timer >= random.randint(75, 150):
                 clouds.append(Cloud())
+                phase_timer.event("spawn", type(clouds[-1]).__name__)
                 cloud_timer = 0
             
+            phase_timer.mark("spawn")
+            
             # Update and draw clouds
             for cloud in list(clouds):
                 cloud.update()
                 cloud.draw(screen)
             
+            phase_timer.mark("clouds")
+            
             # Draw ground
             pygame.draw.line(screen, BLACK, (0, GROUND_HEIGHT), (SCREEN_WIDTH, GROUND_HEIGHT), 1)
             
+            phase_timer.mark("ground")
+            
             # Update and draw dino
             dino.update(user_input)
             dino.draw(screen)
             
+            phase_timer.mark("dino")
+            
             # Update and draw obstacles
             for obstacle in list(obstacles):
                 obstacle.update()
@@ -413,8 +554,17 @@ def main():
                     # Play collision sound
                     if collision_sound:
                         collision_sound.play()
+                    phase_timer.event("collision", type(obstacle).__name__)
                     game_over = True
+            phase_timer.mark("obstacles")
         else:
+            # Attract mode restarts on its own after a short pause
+            if pilot:
+                game_over_frames += 1
+                if game_over_frames >= autopilot.RESTART_FRAMES or idle.timed_out:
+                    game_over_frames = 0
+                    reset_game()
+            
             # Game over screen
             game_over_text = font.render("GAME OVER - Press SPACE to restart", True, BLACK)
             screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 10))
@@ -425,9 +575,17 @@ def main():
         screen.blit(score_text, (10, 10))
         screen.blit(high_score_text, (10, 30))
         
+        phase_timer.mark("hud")
+        phase_timer.draw(screen)  # F3 overlay
+        
         # Update display
         pygame.display.update()
-        clock.tick(30)
+        phase_timer.mark("display")
+        startup_profile.frame_shown()
+        if options.profile_startup and startup_profile.pending and audio_service.done():
+            startup_profile.report()
+        gc_pacer.tick(clock, 30, idle=game_over)
+        phase_timer.mark("tick")
 
 if __name__ == "__main__":
-    main()
+    main(game_options.parse_args())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Precomputed jump physics shared by every Dino/T-Rex variant
+
+This module has no pygame dependency so offline tools (fairness_check.py,
+bots) can import it cheaply.
+"""
+
+# Physics constants used by Dino.jump / TRex.jump in every variant
+JUMP_VEL = 8.5
+GRAVITY = 0.8
+JUMP_SCALE = 4  # Velocity is multiplied by this to get pixels per frame
+DUCK_OFFSET = 20  # Ducking lowers the dino by this many pixels
+
+# Dino states used by hitbox tables (jump states follow as RUN_STATE + n)
+RUN_STATE = 0
+DUCK_STATE = 1
+
+_arc_cache = {}
+
+
+def round_coord(value):
+    """Round a coordinate the way pygame.Rect does (half away from zero)"""
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(-value + 0.5)
+
+
+def jump_arc(jump_vel=JUMP_VEL, gravity=GRAVITY, scale=JUMP_SCALE):
+    """Return the y offsets of a jump, indexed by frames since takeoff
+
+    arc[0] is the frame the jump key was read (still on the ground) and
+    arc[-1] is the landing frame, which is back on the ground as well.
+    The offsets replay the original incremental update exactly, including
+    the per-frame rounding done by pygame.Rect.
+    """
+    key = (jump_vel, gravity, scale)
+    arc = _arc_cache.get(key)
+    if arc is None:
+        offsets = [0]
+        y = 0
+        vel_y = jump_vel
+        while True:
+            y = round_coord(y - vel_y * scale)
+            vel_y -= gravity
+            if vel_y < -jump_vel:
+                offsets.append(0)  # Landed, snapped back to the ground
+                break
+            offsets.append(y)
+        arc = tuple(offsets)
+        _arc_cache[key] = arc
+    return arc
+
+
+def jump_hitboxes(x, y, width, height, arc):
+    """Return the (x, y, width, height) hitbox for every frame of a jump"""
+    return tuple((x, y + offset, width, height) for offset in arc)
+
+
+def state_hitboxes(x, y, width, height, duck_width, duck_height, arc):
+    """Return hitboxes for RUN, DUCK and each airborne/landing jump frame
+
+    Index RUN_STATE is the running rect, DUCK_STATE the ducking rect and
+    index n + 1 the rect n frames after takeoff (n >= 1).
+    """
+    boxes = [(x, y, width, height), (x, y + DUCK_OFFSET, duck_width, duck_height)]
+    boxes.extend(jump_hitboxes(x, y, width, height, arc)[1:])
+    return tuple(boxes)
+
+
+def apex_height(arc):
+    """Return how many pixels above the ground the jump peaks"""
+    return -min(arc)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Per-frame draw-call and surface allocation counters
+
+DrawCounter.install() wraps the pygame entry points the variants render
+through: every pygame.draw function, pygame.Surface() (swapped for a
+counting subclass that still passes isinstance checks for plain Surfaces)
+and HudFont.render() (counted as a text render, and as an allocation on a
+cache miss).  wrap() puts a counting proxy around the screen, so blit(),
+fill() and copy() on it are counted as well.  Each count is charged to
+the class of the calling code (TRex, SpaceRock, HologramCloud, ...) or to
+the function for module-level code such as main.
+
+Surfaces that pygame creates internally (sprite atlas slices, fonts) are
+not pygame.Surface() calls and only show up when blitted to the screen.
+Counting costs a frame lookup per call, so it is only installed on request
+(--draw-stats, and benchmark.py's allocation pass).
+"""
+import sys
+from collections import namedtuple
+
+import pygame
+
+import fonts
+
+DRAW_FUNCTIONS = ("aaline", "aalines", "arc", "circle", "ellipse", "line", "lines", "polygon", "rect")
+
+# Counts for one frame.  `by_class` maps a caller to [draws, blits, surfaces, bytes].
+FrameDraws = namedtuple("FrameDraws", "draws blits surfaces bytes texts by_class")
+
+_BaseSurface = pygame.Surface
+active = None  # The installed DrawCounter, if any
+
+
+def _caller(depth=2):
+    """Return the class (or function) name of the code `depth` frames up"""
+    code = sys._getframe(depth).f_code
+    return getattr(code, "co_qualname", code.co_name).split(".", 1)[0]
+
+
+class _CountingType(type):
+    # Plain Surfaces (the screen, atlas slices, font renders) are still Surfaces
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, _BaseSurface)
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, _BaseSurface)
+
+
+class CountedSurface(_BaseSurface, metaclass=_CountingType):
+    """Stands in for pygame.Surface while counters are installed"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if active:
+            active.count(2, self.get_width() * self.get_height() * self.get_bytesize())
+
+    def blit(self, *args, **kwargs):
+        if active:
+            active.count(1)
+        return super().blit(*args, **kwargs)
+
+    def copy(self):
+        if active:
+            active.count(2, self.get_width() * self.get_height() * self.get_bytesize())
+        return super().copy()
+
+
+class CountingScreen:
+    """Proxy for the display surface that counts what is drawn onto it"""
+
+    def __init__(self, surface, counter):
+        self.surface = surface
+        self.counter = counter
+
+    def blit(self, *args, **kwargs):
+        self.counter.count(1)
+        return self.surface.blit(*args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        self.counter.count(0)
+        return self.surface.fill(*args, **kwargs)
+
+    def copy(self):
+        surface = self.surface
+        self.counter.count(2, surface.get_width() * surface.get_height() * surface.get_bytesize())
+        return surface.copy()
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+
+def _unwrap(surface):
+    return surface.surface if type(surface) is CountingScreen else surface
+
+
+class DrawCounter:
+    def __init__(self):
+        self.current = [0, 0, 0, 0, 0]  # draws, blits, surfaces, bytes, texts
+        self.by_class = {}
+        self.last = None  # FrameDraws of the last complete frame
+        self.totals = [0, 0, 0, 0, 0]
+        self.class_totals = {}
+        self.frames = 0
+        self._originals = {}
+
+    def install(self):
+        """Start counting; returns self"""
+        global active
+        if active is not None:
+            raise RuntimeError("a DrawCounter is already installed")
+        active = self
+        for name in DRAW_FUNCTIONS:
+            self._originals[name] = getattr(pygame.draw, name)
+            setattr(pygame.draw, name, self._draw_wrapper(self._originals[name]))
+        pygame.Surface = CountedSurface
+        self._originals["render"] = render = fonts.HudFont.render
+
+        def counted_render(font, text, antialias, color, background=None):
+            missed = (text, antialias, color, background) not in font._cache
+            surface = render(font, text, antialias, color, background)
+            self.current[4] += 1
+            if missed:
+                self.count(2, surface.get_width() * surface.get_height() * surface.get_bytesize())
+            return surface
+
+        fonts.HudFont.render = counted_render
+        return self
+
+    def uninstall(self):
+        global active
+        for name in DRAW_FUNCTIONS:
+            setattr(pygame.draw, name, self._originals[name])
+        pygame.Surface = _BaseSurface
+        fonts.HudFont.render = self._originals["render"]
+        active = None
+
+    def wrap(self, screen):
+        """Return a proxy for the screen that counts blits and fills onto it"""
+        return CountingScreen(_unwrap(screen), self)
+
+    def _draw_wrapper(self, function):
+        def counted(surface, *args, **kwargs):
+            self.count(0)
+            return function(_unwrap(surface), *args, **kwargs)
+        counted.__name__ = function.__name__
+        return counted
+
+    def count(self, kind, nbytes=0):
+        """Count one draw (0), blit (1) or surface allocation (2) for the caller"""
+        current = self.current
+        current[kind] += 1
+        current[3] += nbytes
+        # Past count() and the wrapper to the game code that called it
+        caller = _caller(3)
+        row = self.by_class.get(caller)
+        if row is None:
+            row = self.by_class[caller] = [0, 0, 0, 0]
+        row[kind] += 1
+        row[3] += nbytes
+
+    def next_frame(self):
+        """Close the current frame's counts; call once per frame"""
+        self.last = FrameDraws(*self.current, self.by_class)
+        for i, value in enumerate(self.current):
+            self.totals[i] += value
+        for name, row in self.by_class.items():
+            total = self.class_totals.setdefault(name, [0, 0, 0, 0])
+            for i, value in enumerate(row):
+                total[i] += value
+        self.frames += 1
+        self.current = [0, 0, 0, 0, 0]
+        self.by_class = {}
+
+    def averages(self):
+        """Return per-frame averages over every closed frame"""
+        frames = self.frames or 1
+        draws, blits, surfaces, nbytes, texts = (value / frames for value in self.totals)
+        return {
+            "draws_per_frame": draws,
+            "blits_per_frame": blits,
+            "surfaces_per_frame": surfaces,
+            "surface_kib_per_frame": nbytes / 1024,
+            "text_renders_per_frame": texts,
+            "by_class": {name: {"draws": row[0] / frames, "blits": row[1] / frames,
+                                "surfaces": row[2] / frames, "kib": row[3] / 1024 / frames}
+                         for name, row in sorted(self.class_totals.items(), key=lambda item: -sum(item[1][:3]))},
+        }
+
+    def report(self):
+        """Print per-frame averages and the busiest callers"""
+        stats = self.averages()
+        print(f"Draw stats over {self.frames} frames: {stats['draws_per_frame']:.1f} draws, "
+              f"{stats['blits_per_frame']:.1f} blits, {stats['surfaces_per_frame']:.2f} surfaces "
+              f"({stats['surface_kib_per_frame']:.1f} KiB), {stats['text_renders_per_frame']:.1f} text renders per frame")
+        for name, row in list(stats["by_class"].items())[:8]:
+            print(f"  {name:<18} {row['draws']:8.1f} draws {row['blits']:6.1f} blits "
+                  f"{row['surfaces']:6.2f} surfaces {row['kib']:8.1f} KiB")
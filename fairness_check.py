@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Offline obstacle-sequence fairness validator
+
+Generates the obstacle stream a variant would spawn for a given seed and
+proves whether a perfect player could clear it, using the precomputed jump
+arc from dino_physics instead of simulating the game frame by frame.
+
+The reachable dino states (running, ducking, N frames into a jump) are kept
+as a bitmask, so each frame is a couple of integer operations and gaps
+between obstacles are skipped entirely.  No pygame is needed.
+
+Usage:
+    python fairness_check.py --variant dino_game_space_enhanced --seed 3
+    python fairness_check.py --variant all --seeds 100 --obstacles 5000
+"""
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+
+import dino_physics
+import variant_specs
+
+# One spawned obstacle.  `kind` is "ground" or "flyer", `turns` holds the
+# vertical speeds an AlienShip picks at spawn and every 30 frames after.
+ObstacleSpec = namedtuple("ObstacleSpec", "frame kind type width height y multiplier turns")
+
+# Result of validating a stream.  `failures` is a list of
+# (frame, obstacle indexes) for every pattern no player could survive.
+Verdict = namedtuple("Verdict", "ok obstacles frames failures")
+
+DRIFT_TURNS = 4  # Enough direction changes to outlive any ship on screen
+
+
+def generate_stream(variant, seed, count):
+    """Yield `count` ObstacleSpecs following the variant's spawn rules
+
+    The stream reproduces the game's spawn timing and obstacle
+    distributions from its own seeded RNG; it does not replay the exact
+    random.* call sequence of a live session (clouds and sprite details
+    draw from the same global RNG in the game).
+    """
+    spec = variant_specs.VARIANTS[variant]
+    rng = random.Random(seed)
+    ground_sizes = spec["ground_sizes"]
+    flyer_width, flyer_height = spec["flyer_size"]
+    frame = 0
+    timer = 0
+    spawned = 0
+    while spawned < count:
+        score = frame + 1
+        timer += 1
+        if spec["spawn"] == "ramped":
+            frequency = max(30, 100 - (score // 500))
+            threshold = rng.randint(frequency // 2, frequency)
+        else:
+            threshold = rng.randint(50, 150)
+        if timer >= threshold:
+            if rng.randint(0, 2) == 0:  # 1/3 chance for a flying obstacle
+                y = rng.choice(variant_specs.FLYER_HEIGHTS)
+                multiplier = rng.uniform(*spec["flyer_speed"]) if spec["flyer_speed"] else None
+                turns = None
+                if spec["drift"]:
+                    turns = tuple(rng.choice([-1, 0, 1]) for _ in range(DRIFT_TURNS))
+                yield ObstacleSpec(frame, "flyer", 0, flyer_width, flyer_height, y, multiplier, turns)
+            else:
+                kind = rng.randint(0, 2)
+                width, height = ground_sizes[kind]
+                multiplier = rng.uniform(*spec["ground_speed"][kind]) if spec["ground_speed"] else None
+                yield ObstacleSpec(frame, "ground", kind, width, height,
+                                   variant_specs.GROUND_HEIGHT - height, multiplier, None)
+            spawned += 1
+            timer = 0
+        frame += 1
+
+
+class FairnessValidator:
+    """Proves whether a perfect player can clear an obstacle stream"""
+
+    def __init__(self, variant):
+        spec = variant_specs.VARIANTS[variant]
+        self.variant = variant
+        self.spec = spec
+        width, height = spec["dino"]
+        duck_width, duck_height = spec["duck"]
+        self.arc = dino_physics.jump_arc()
+        self.boxes = dino_physics.state_hitboxes(
+            variant_specs.DINO_X, variant_specs.GROUND_HEIGHT - height, width, height,
+            duck_width, duck_height, self.arc)
+        self.narrow_right = variant_specs.DINO_X + width
+        self.wide_right = variant_specs.DINO_X + duck_width
+
+        # State bitmasks: bit 0 runs, bit 1 ducks, bit n + 1 is n frames into a jump
+        landing = len(self.arc)  # Index of the landing frame state
+        self.full = (1 << (landing + 1)) - 1
+        self.grounded = (1 << dino_physics.RUN_STATE) | (1 << dino_physics.DUCK_STATE) | (1 << landing)
+        self.takeoff = (1 << dino_physics.RUN_STATE) | (1 << dino_physics.DUCK_STATE) | (1 << 2)
+        self.airborne = self.full & ~self.grounded
+        self.settle_frames = landing  # After this many free frames every state is reachable
+
+        self._vertical_cache = {}
+        self._speeds = [spec["start_speed"]]
+
+    def _speed(self, frame):
+        """Return game_speed during `frame` (bumped every 100 points)"""
+        block = frame // 100
+        speeds = self._speeds
+        while len(speeds) <= block:
+            speed = speeds[-1]
+            if self.spec["max_speed"] is None or speed < self.spec["max_speed"]:
+                speed += self.spec["speed_step"]
+            speeds.append(speed)
+        return speeds[block]
+
+    def _vertical_masks(self, top, height):
+        """Return (narrow, wide) masks of dino states overlapping rows top..top+height"""
+        key = (top, height)
+        masks = self._vertical_cache.get(key)
+        if masks is None:
+            bottom = top + height
+            narrow = wide = 0
+            for state, (_, y, _, h) in enumerate(self.boxes):
+                if y < bottom and top < y + h:
+                    if state == dino_physics.DUCK_STATE:
+                        wide |= 1 << state
+                    else:
+                        narrow |= 1 << state
+            masks = (narrow, wide)
+            self._vertical_cache[key] = masks
+        return masks
+
+    def _forbidden_frames(self, obstacle):
+        """Yield (frame, forbidden state mask) while the obstacle overlaps the dino"""
+        x = variant_specs.SCREEN_WIDTH
+        y = obstacle.y
+        width = obstacle.width
+        height = obstacle.height
+        multiplier = obstacle.multiplier
+        turns = obstacle.turns
+        turn = 0
+        vertical_speed = turns[0] if turns else 0
+        drift_timer = 0
+        frame = obstacle.frame
+        masks = self._vertical_masks(y, height)
+        while True:
+            if turns:
+                drift_timer += 1
+                if drift_timer >= variant_specs.DRIFT_INTERVAL:
+                    drift_timer = 0
+                    turn = min(turn + 1, len(turns) - 1)
+                    vertical_speed = turns[turn]
+                y += vertical_speed
+                if y < 50:
+                    y = 50
+                    vertical_speed = 1  # Bounces off the bounds until the next turn, like the game
+                elif y > variant_specs.GROUND_HEIGHT - 50:
+                    y = variant_specs.GROUND_HEIGHT - 50
+                    vertical_speed = -1
+                masks = self._vertical_masks(y, height)
+            speed = self._speed(frame)
+            if multiplier is None:
+                x = dino_physics.round_coord(x - speed)
+            else:
+                x -= int(speed * multiplier)
+            right = x + width
+            if right <= variant_specs.DINO_X:
+                return
+            forbidden = 0
+            if x < self.narrow_right:
+                forbidden |= masks[0]
+            if x < self.wide_right:
+                forbidden |= masks[1]
+            if forbidden:
+                yield frame, forbidden
+            frame += 1
+
+    def _step(self, mask):
+        """Advance the reachable state mask by one unobstructed frame"""
+        following = (mask & self.airborne) << 1
+        if mask & self.grounded:
+            following |= self.takeoff
+        return following
+
+    def validate(self, stream):
+        """Validate an iterable of ObstacleSpecs (in spawn order)"""
+        pending = {}  # frame -> [forbidden mask, obstacle indexes]
+        failures = []
+        mask = 1 << dino_physics.RUN_STATE
+        frame = 0
+        count = 0
+        last_failed = ()
+
+        def advance(until):
+            # Walk the reachable set forward through every frame before `until`
+            nonlocal mask, frame, last_failed
+            while frame < until:
+                if pending:
+                    next_event = min(pending)
+                else:
+                    next_event = until
+                if next_event >= until:
+                    gap = until - frame
+                else:
+                    gap = next_event - frame
+                if gap > self.settle_frames:
+                    mask = self.full
+                else:
+                    for _ in range(gap):
+                        mask = self._step(mask)
+                frame += gap
+                if frame >= until:
+                    break
+                forbidden, culprits = pending.pop(frame)
+                mask = self._step(mask) & ~forbidden
+                if not mask:
+                    # Nobody survives this frame; record it once per pattern
+                    if not set(culprits) & set(last_failed):
+                        failures.append((frame, tuple(culprits)))
+                    last_failed = culprits
+                    mask = self.full & ~forbidden or self.full
+                frame += 1
+
+        for index, obstacle in enumerate(stream):
+            advance(obstacle.frame)
+            for hit_frame, forbidden in self._forbidden_frames(obstacle):
+                entry = pending.get(hit_frame)
+                if entry is None:
+                    pending[hit_frame] = [forbidden, [index]]
+                else:
+                    entry[0] |= forbidden
+                    entry[1].append(index)
+            count += 1
+        advance(max(pending) + 1 if pending else frame)
+        return Verdict(not failures, count, frame, failures)
+
+
+def check_seed(variant, seed, count):
+    """Validate the generated stream for one variant and seed"""
+    return FairnessValidator(variant).validate(generate_stream(variant, seed, count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prove obstacle streams are clearable")
+    parser.add_argument("--variant", default="all", help="Game module name or 'all'")
+    parser.add_argument("--seed", type=int, default=0, help="First seed to check")
+    parser.add_argument("--seeds", type=int, default=1, help="Number of consecutive seeds")
+    parser.add_argument("--obstacles", type=int, default=1000, help="Obstacles per seed")
+    parser.add_argument("--verbose", action="store_true", help="Print every impossible pattern")
+    args = parser.parse_args(argv)
+
+    try:
+        variants = variant_specs.select(args.variant)
+    except ValueError as e:
+        parser.error(str(e))
+
+    unfair = 0
+    for variant in variants:
+        validator = FairnessValidator(variant)
+        total = 0
+        impossible = 0
+        start = time.perf_counter()
+        for seed in range(args.seed, args.seed + args.seeds):
+            stream = list(generate_stream(variant, seed, args.obstacles))
+            verdict = validator.validate(stream)
+            total += verdict.obstacles
+            impossible += len(verdict.failures)
+            if verdict.failures:
+                unfair += 1
+            if args.verbose:
+                for frame, culprits in verdict.failures:
+                    shapes = ", ".join(
+                        f"{stream[i].kind} {stream[i].width}x{stream[i].height}@{stream[i].y}"
+                        for i in culprits)
+                    print(f"  {variant} seed {seed} frame {frame}: {shapes}")
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed * 60 if elapsed > 0 else float("inf")
+        print(f"{variant}: {total} obstacles, {impossible} impossible patterns "
+              f"({rate:,.0f} obstacles/min)")
+    return 1 if unfair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Font loading without a system font scan on every launch
+
+pygame.font.SysFont() runs fc-list (or walks the font directories) on
+every start and quietly falls back to a smaller default font when Arial
+is missing.  Here the lookup happens once: the resolved path is kept in
+fonts.json in the cache directory and reused while the file is still
+there.  When the font isn't installed, the font bundled with pygame is
+used at the requested size, so the HUD looks the same on every machine.
+Text is rendered through pygame.freetype where available, and recently
+rendered strings are kept so static HUD text isn't rasterized each frame.
+"""
+import json
+import os
+import tempfile
+
+import pygame
+
+import cache_paths
+
+try:
+    import pygame.freetype as freetype
+except ImportError:  # Optional: pygame.font works too
+    freetype = None
+
+TEXT_CACHE_SIZE = 64  # Rendered strings kept per font
+
+_resolved = None  # In-memory copy of fonts.json
+
+
+def bundled_font():
+    """Return the path of the font that ships with pygame"""
+    return os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+
+
+def _index_path():
+    return os.path.join(cache_paths.cache_dir(), "fonts.json")
+
+
+def _read_index():
+    try:
+        with open(_index_path(), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(index):
+    """Write fonts.json atomically; failures only cost the cache"""
+    path = _index_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as out:
+                json.dump(index, out, sort_keys=True)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+def resolve(name, bold=False):
+    """Return the font file for a system font name, scanning only on a cache miss"""
+    global _resolved
+    if _resolved is None:
+        _resolved = _read_index()
+    key = f"{name.lower()}|{'bold' if bold else 'regular'}"
+    path = _resolved.get(key)
+    if path and os.path.exists(path):
+        return path
+    path = pygame.font.match_font(name, bold=bold) or bundled_font()
+    _resolved[key] = path
+    _write_index(_resolved)
+    return path
+
+
+class HudFont:
+    """Drop-in for pygame.font.Font.render() backed by freetype when available"""
+
+    def __init__(self, path, size, bold=False):
+        self.path = path
+        self.point_size = size
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+        if freetype is not None:
+            if not freetype.get_init():
+                freetype.init()
+            self._font = freetype.Font(path, size)
+            self._font.strong = bold
+            self._font.pad = True  # Full line height, like pygame.font
+        else:
+            self._font = pygame.font.Font(path, size)
+            self._font.set_bold(bold)
+
+    def render(self, text, antialias, color, background=None):
+        key = (text, antialias, color, background)
+        surface = self._cache.get(key)
+        if surface is None:
+            self.misses += 1
+            if len(self._cache) >= TEXT_CACHE_SIZE:
+                self._cache.clear()
+            if freetype is not None:
+                self._font.antialiased = antialias
+                surface = self._font.render(text, color, background)[0]
+            else:
+                surface = self._font.render(text, antialias, color, background)
+            self._cache[key] = surface
+        else:
+            self.hits += 1
+        return surface
+
+
+def load(name, size, bold=False):
+    """Return a HudFont for a system font name such as "Arial" """
+    path = resolve(name, bold)
+    # A regular face standing in for a missing bold one gets synthetic bold
+    # (the bundled font is bold already)
+    synthetic = bold and path == resolve(name) and path != bundled_font()
+    return HudFont(path, size, bold=synthetic)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Per-phase frame timings with an on-screen overlay
+
+The main loop calls frame() at the top of every iteration and mark(name)
+after each phase (events, input, background, clouds, ...); mark() charges
+the time since the previous mark to that phase.  The overlay, toggled with
+F3, shows a rolling graph of each frame's busy time against the frame
+budget and a bar per phase, so the phase that blows the budget stands out.
+
+With a trace_export.TraceWriter attached (--trace), every frame and
+phase is also sent to it as a span, and event() records spawns and
+collisions; timing then stays on even while the overlay is hidden.
+Listeners (watchdog.FrameWatchdog, metrics_server.MetricsServer,
+quality_governor.QualityGovernor) keep timing on the same way: each is
+told when a frame starts, gets the finished frame's phase timings and
+hears about every event.
+
+suspend() closes a frame without starting the next one, for the loop to
+sleep in between (see idle_screen.py).
+
+While the overlay is off and nothing is traced, frame(), mark(),
+suspend() and event() are a shared no-op function, so the loop pays one
+empty call per phase and takes no timestamps.
+"""
+import time
+from collections import deque
+
+import pygame
+
+import fonts
+
+HISTORY = 120  # Frames in the rolling graph (4 seconds at 30 FPS)
+SMOOTHING = 0.1  # Weight of the newest frame in the per-phase averages
+IDLE_PHASES = ("tick",)  # Time spent waiting for the frame cap, not working
+PANEL_WIDTH = 260
+GRAPH_HEIGHT = 60
+ROW_HEIGHT = 14
+BAR_WIDTH = 120  # Width of a bar that uses the whole frame budget
+DRAW_ROWS = 4  # Callers listed under the draw counters (draws/blits/surfaces)
+BACKGROUND = (0, 0, 0, 170)
+TEXT = (230, 230, 230)
+OK = (80, 200, 120)
+OVER = (230, 70, 70)
+BUDGET_LINE = (240, 200, 60)
+
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, fps=30, tracer=None, counters=None, listeners=()):
+        self.budget_ms = 1000 / fps
+        self.tracer = tracer
+        self.counters = counters
+        self.listeners = [listener for listener in listeners if listener]  # None for switched-off ones
+        self.history = deque(maxlen=HISTORY)  # Busy milliseconds per frame
+        self.phases = {}  # name -> smoothed milliseconds, in loop order
+        self.current = {}  # name -> nanoseconds spent so far this frame
+        self.font = None
+        self._last = None
+        self._frame_start = None
+        self.event = self._event if tracer or self.listeners else _noop
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        """Show or hide the overlay; timing stays on while anything else listens"""
+        self.enabled = enabled
+        # Off, the loop's calls land on a no-op and nothing is timed
+        timing = enabled or self.tracer is not None or bool(self.listeners)
+        self.frame = self._frame if timing else _noop
+        self.mark = self._mark if timing else _noop
+        self.suspend = self._suspend if timing else _noop
+        self.current = {}
+        self._last = time.perf_counter_ns()
+        self._frame_start = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def _frame(self):
+        """Close the previous frame and start timing a new one"""
+        now = time.perf_counter_ns()
+        self._close(now)
+        for listener in self.listeners:
+            listener.frame_started(now)
+        self._last = self._frame_start = now
+
+    def _suspend(self):
+        """Close the current frame without starting one; the loop is about to sleep"""
+        self._close(time.perf_counter_ns())
+        self._frame_start = None
+
+    def _close(self, now):
+        if self.current:
+            busy = 0
+            for name, ns in self.current.items():
+                ms = ns / 1e6
+                if name not in IDLE_PHASES:
+                    busy += ms
+                previous = self.phases.get(name)
+                self.phases[name] = ms if previous is None else previous + SMOOTHING * (ms - previous)
+            self.history.append(busy)
+        if self._frame_start is not None:
+            if self.tracer:
+                self.tracer.span("frame", self._frame_start, now - self._frame_start, "frame")
+            for listener in self.listeners:
+                listener.frame_done(now - self._frame_start, self.current)
+        self.current = {}
+
+    def _mark(self, name):
+        """Charge the time since the last mark to phase `name`"""
+        now = time.perf_counter_ns()
+        self.current[name] = self.current.get(name, 0) + now - self._last
+        if self.tracer:
+            self.tracer.span(name, self._last, now - self._last)
+        self._last = now
+
+    def _event(self, name, detail=None):
+        """Pass a spawn, collision or sound to the tracer and listeners"""
+        if self.tracer:
+            self.tracer.instant(name, detail)
+        for listener in self.listeners:
+            listener.note(name, detail)
+
+    def draw(self, screen):
+        """Blit the overlay in the top-right corner; timed as phase "overlay" """
+        if not self.enabled or not self.history:
+            return
+        if self.font is None:
+            self.font = fonts.load("Arial", 11)
+        draws = self.counters.last if self.counters else None
+        rows = len(self.phases) + (1 + min(len(draws.by_class), DRAW_ROWS) if draws else 0)
+        panel = pygame.Surface((PANEL_WIDTH, GRAPH_HEIGHT + 24 + rows * ROW_HEIGHT), pygame.SRCALPHA)
+        panel.fill(BACKGROUND)
+
+        # Rolling graph: one column per frame, the budget at two thirds height
+        scale = GRAPH_HEIGHT * 2 / 3 / self.budget_ms
+        column = max(1, PANEL_WIDTH // HISTORY)
+        for i, ms in enumerate(self.history):
+            height = min(GRAPH_HEIGHT, max(1, int(ms * scale)))
+            color = OVER if ms > self.budget_ms else OK
+            pygame.draw.rect(panel, color, (i * column, GRAPH_HEIGHT - height, column, height))
+        budget_y = GRAPH_HEIGHT - int(self.budget_ms * scale)
+        pygame.draw.line(panel, BUDGET_LINE, (0, budget_y), (PANEL_WIDTH, budget_y))
+        worst = max(self.history)
+        caption = f"busy {self.history[-1]:.1f} ms  worst {worst:.1f} / {self.budget_ms:.1f} ms"
+        panel.blit(self.font.render(caption, True, TEXT), (4, GRAPH_HEIGHT + 4))
+
+        # One bar per phase, scaled to the frame budget
+        y = GRAPH_HEIGHT + 22
+        for name, ms in self.phases.items():
+            panel.blit(self.font.render(name, True, TEXT), (4, y))
+            panel.blit(self.font.render(f"{ms:.1f}", True, TEXT), (84, y))
+            width = min(BAR_WIDTH, int(ms / self.budget_ms * BAR_WIDTH))
+            color = BUDGET_LINE if name in IDLE_PHASES else OK
+            pygame.draw.rect(panel, color, (PANEL_WIDTH - BAR_WIDTH - 4, y + 3, max(1, width), ROW_HEIGHT - 6))
+            y += ROW_HEIGHT
+
+        # Draw counters of the last frame, busiest callers first
+        if draws:
+            summary = (f"draws {draws.draws}  blits {draws.blits}  "
+                       f"surfaces {draws.surfaces} ({draws.bytes / 1024:.0f} KiB)")
+            panel.blit(self.font.render(summary, True, TEXT), (4, y))
+            busiest = sorted(draws.by_class.items(), key=lambda item: -sum(item[1][:3]))[:DRAW_ROWS]
+            for name, (calls, blits, surfaces, _) in busiest:
+                y += ROW_HEIGHT
+                panel.blit(self.font.render(f"{name}: {calls}/{blits}/{surfaces}", True, TEXT), (12, y))
+        screen.blit(panel, (screen.get_width() - PANEL_WIDTH - 10, 10))
+        self._mark("overlay")
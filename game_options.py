@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Command line options shared by every dino_game_*.py variant"""
+import argparse
+
+
+def build_parser():
+    """Return the argument parser used by all variants"""
+    parser = argparse.ArgumentParser(description="Run the dino runner game")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="Let the built-in bot play (attract mode)")
+    parser.add_argument("--autopilot-budget-ms", type=float, default=0.5,
+                        help="Per-frame decision budget for the autopilot")
+    parser.add_argument("--audio-buffer", type=int, default=512,
+                        help="Mixer buffer size in samples (smaller means less latency)")
+    parser.add_argument("--audio-stats", action="store_true",
+                        help="Print sound trigger latency statistics on exit")
+    parser.add_argument("--no-music", dest="music", action="store_false",
+                        help="Turn off the background music")
+    parser.add_argument("--gc-pacing", action="store_true",
+                        help="Freeze startup objects, turn off automatic garbage collection and "
+                             "collect in spare frame time and on the game-over screen instead")
+    parser.add_argument("--quality", choices=("auto", "full", "low"), default="auto",
+                        help="Effect detail in the futuristic and space variants: follow the frame "
+                             "budget (auto), or pin it to full or low")
+    parser.add_argument("--frame-profile", action="store_true",
+                        help="Start with the frame-phase overlay on (toggle with F3)")
+    parser.add_argument("--draw-stats", action="store_true",
+                        help="Count draw calls, blits and surface allocations per frame "
+                             "(shown in the F3 overlay, summarized on exit)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write frame phases, spawns, collisions and sounds as a Chrome trace")
+    parser.add_argument("--watchdog-ms", type=float, metavar="MS",
+                        help="Log frames slower than MS (e.g. 40) with their phase timings, entity "
+                             "counts and a stack snapshot to slow_frames.log")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve FPS, frame times, entity counts, cache and GC stats and the "
+                             "score at http://HOST:PORT/metrics in Prometheus text format")
+    parser.add_argument("--metrics-host", default="127.0.0.1", metavar="HOST",
+                        help="Address the metrics endpoint listens on (0.0.0.0 for remote scrapers)")
+    parser.add_argument("--profile-sample", nargs="?", const="profile.folded", metavar="PATH",
+                        help="Sample the game loop's stack every millisecond and write "
+                             "folded stacks for a flamegraph on exit (default profile.folded)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print where startup time went once the first frame is up")
+    return parser
+
+
+def parse_args(argv=None):
+    """Parse variant options; pass [] to get the defaults"""
+    return build_parser().parse_args(argv)
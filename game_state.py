@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Cheap, immutable snapshots of a running game session
+
+A snapshot records the mutable fields of every entity (rects as tuples,
+lists as tuples) and keeps Surfaces by reference, so taking one never copies
+pixels.  Restoring writes the fields back onto the same entity objects, which
+the snapshot keeps alive even after they leave the obstacle/cloud lists.
+"""
+import random
+from collections import namedtuple
+
+import pygame
+
+# Immutable record of one frame.  `dino`, `obstacles` and `clouds` hold
+# (entity, fields) pairs, `timers` the loop counters kept in main() and
+# `scenery` the star/planet lists of the variants that have them.
+GameSnapshot = namedtuple(
+    "GameSnapshot",
+    "dino obstacles clouds score game_speed high_score timers scenery rng",
+)
+
+# Snapshot/restore handles for a running main() loop
+Session = namedtuple("Session", "snapshot restore")
+
+_static_fields = {}
+
+
+def _is_sprite_list(value):
+    return isinstance(value, list) and bool(value) and isinstance(value[0], pygame.Surface)
+
+
+def _static(entity):
+    """Return the attribute names that never change after __init__ (sprite lists)"""
+    cls = type(entity)
+    names = _static_fields.get(cls)
+    if names is None:
+        names = frozenset(name for name, value in vars(entity).items() if _is_sprite_list(value))
+        _static_fields[cls] = names
+    return names
+
+
+def freeze(entity):
+    """Return an (entity, fields) pair capturing the entity's mutable state"""
+    static = _static(entity)
+    fields = []
+    for name, value in vars(entity).items():
+        if name in static:
+            continue
+        kind = type(value)
+        if kind is pygame.Rect or kind is list:
+            value = (kind, tuple(value))
+        fields.append((name, value))
+    return entity, tuple(fields)
+
+
+def thaw(frozen):
+    """Write a frozen (entity, fields) pair back and return the entity"""
+    entity, fields = frozen
+    for name, value in fields:
+        if type(value) is tuple and len(value) == 2 and value[0] in (pygame.Rect, list):
+            value = value[0](value[1])
+        setattr(entity, name, value)
+    return entity
+
+
+def freeze_scenery(rows):
+    """Capture a list of mutable [x, y, ...] rows such as stars or planets"""
+    return tuple(tuple(row) for row in rows)
+
+
+def thaw_scenery(rows, frozen):
+    """Restore scenery rows in place so module-level references stay valid"""
+    rows[:] = [list(row) for row in frozen]
+
+
+def capture(dino, obstacles, clouds, score, game_speed, high_score, timers, scenery=(), rng=True):
+    """Build a GameSnapshot from the pieces main() keeps track of
+
+    Pass rng=False to leave the RNG state out (restore then keeps the
+    current RNG), e.g. for high-rate captures that don't need replay.
+    """
+    return GameSnapshot(
+        freeze(dino),
+        tuple(freeze(obstacle) for obstacle in obstacles),
+        tuple(freeze(cloud) for cloud in clouds),
+        score,
+        game_speed,
+        high_score,
+        tuple(timers),
+        tuple(freeze_scenery(rows) for rows in scenery),
+        random.getstate() if rng else None,
+    )
+
+
+def restore_entities(snapshot, scenery=()):
+    """Restore entities, scenery and RNG; return fresh (obstacles, clouds) lists
+
+    Scenery and RNG are only restored when the snapshot captured them.
+    """
+    thaw(snapshot.dino)
+    obstacles = [thaw(frozen) for frozen in snapshot.obstacles]
+    clouds = [thaw(frozen) for frozen in snapshot.clouds]
+    for rows, frozen in zip(scenery, snapshot.scenery):
+        thaw_scenery(rows, frozen)
+    if snapshot.rng is not None:
+        random.setstate(snapshot.rng)
+    return obstacles, clouds
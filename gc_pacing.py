@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Garbage collection paced by the frame loop
+
+CPython runs a generation-0 collection whenever allocations outnumber
+frees by 700, wherever the loop happens to be, and every so often that
+escalates into a full collection that walks every object the game holds:
+sprite caches, fonts, synthesized sounds.  The frame that pays for it
+stutters, and it is as likely to be mid-jump as anywhere.
+
+With --gc-pacing, GCPacer collects once after startup, moves everything
+that survived into the permanent generation with gc.freeze() so no later
+collection scans it, and turns automatic collection off.  tick() stands
+in for clock.tick(): before waiting for the frame cap it collects the
+young generations if the frame's work left enough of the budget spare,
+and it runs the one full collection of a game while the game-over screen
+is up.  Should spare time never show up, a collection is forced once the
+young generation has grown to FORCE_FACTOR times the usual threshold, so
+memory stays bounded.  Time spent collecting is charged to the profiler
+as phase "gc".
+"""
+import gc
+import time
+
+RESERVE_MS = 2.0  # Spare time left in the frame after a collection
+FORCE_FACTOR = 8  # Collect regardless once counts pass this many thresholds
+COST_SMOOTHING = 0.2  # Weight of the newest collection in the cost estimates
+
+
+class GCPacer:
+    def __init__(self, enabled=False, profiler=None):
+        self.enabled = enabled
+        self.profiler = profiler
+        self.thresholds = gc.get_threshold()
+        self.cost_ms = [0.2, 0.5, 2.0]  # Estimated collection time per generation
+        self.collections = [0, 0, 0]  # Paced collections per generation
+        self.forced = 0
+        self.pause_ns = 0
+        self.frozen = 0
+        self._idle_collected = False
+        self._frame_start = time.perf_counter_ns()
+        if enabled:
+            gc.collect()
+            gc.freeze()
+            self.frozen = gc.get_freeze_count()
+            gc.disable()
+
+    def tick(self, clock, fps, idle=False):
+        """clock.tick(fps), collecting in the frame's spare time first
+
+        `idle` is true while nothing moves (the game-over screen); that is
+        when the full collection runs.
+        """
+        if self.enabled:
+            self._collect(1000 / fps, idle)
+            if self.profiler:
+                self.profiler.mark("gc")
+        result = clock.tick(fps)
+        self._frame_start = time.perf_counter_ns()
+        return result
+
+    def _collect(self, budget_ms, idle):
+        if not idle:
+            self._idle_collected = False
+        elif not self._idle_collected:
+            self._idle_collected = True
+            self._run(2)
+            return
+        counts = gc.get_count()
+        if counts[2] >= self.thresholds[2] * FORCE_FACTOR:
+            generation = 2  # No game over for a long while
+        elif counts[1] >= self.thresholds[1]:
+            generation = 1
+        elif counts[0] >= self.thresholds[0]:
+            generation = 0
+        else:
+            return
+        spare_ms = budget_ms - (time.perf_counter_ns() - self._frame_start) / 1e6
+        if spare_ms - self.cost_ms[generation] >= RESERVE_MS:
+            self._run(generation)
+        elif counts[0] >= self.thresholds[0] * FORCE_FACTOR:
+            self.forced += 1
+            self._run(generation)
+
+    def _run(self, generation):
+        start = time.perf_counter_ns()
+        gc.collect(generation)
+        elapsed = time.perf_counter_ns() - start
+        self.pause_ns += elapsed
+        self.collections[generation] += 1
+        cost = self.cost_ms[generation]
+        self.cost_ms[generation] = cost + COST_SMOOTHING * (elapsed / 1e6 - cost)
+
+    def report(self):
+        young, middle, full = self.collections
+        print(f"GC pacing: {self.frozen} objects frozen, {young}/{middle}/{full} collections "
+              f"(gen 0/1/full) taking {self.pause_ns / 1e6:.1f} ms, {self.forced} forced without spare time")
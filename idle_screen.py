@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Sleeping through the game-over and pause screens
+
+Nothing moves on the game-over screen, yet the loop used to repaint it
+and tick at 30 FPS for as long as it stayed up, which on a kiosk is hours
+of a busy core.  IdleScreen.events() stands in for pygame.event.get() at
+the top of the loop: while the game is idle (over or paused) it lets one
+frame through so the screen gets drawn, then blocks in pygame.event.wait()
+until something happens.  Mouse movement doesn't count.  In attract mode
+the game-over wait also ends once `wake_ms` have passed since the game
+ended, and `timed_out` tells the loop it is time to restart; a paused
+game only wakes up for events.
+
+The pause key halts the simulation without drawing another frame at all:
+draw_paused() puts a caption over the last frame and the loop skips the
+rest of its body until the game is resumed.
+"""
+import time
+
+import pygame
+
+PAUSE_KEY = pygame.K_p
+PAUSED_TEXT = "PAUSED - Press P to resume"
+IGNORED_EVENTS = (pygame.MOUSEMOTION,)  # Don't wake up for these
+
+
+class IdleScreen:
+    def __init__(self, profiler=None, wake_ms=None):
+        self.profiler = profiler
+        self.wake_ms = wake_ms  # Longest stay on an idle screen, None for no limit
+        self.shown = False  # The idle screen has been drawn
+        self.timed_out = False
+        self.sleeps = 0
+        self._since = None  # time.monotonic() when the game went idle
+
+    def events(self, game_over, paused=False):
+        """Return this frame's events, sleeping until one arrives while idle"""
+        if not (game_over or paused):
+            self.shown = self.timed_out = False
+            self._since = None
+            return pygame.event.get()
+        if self._since is None:
+            self._since = time.monotonic()
+        if not self.shown:
+            self.shown = True  # Draw this frame, sleep from the next one on
+            return pygame.event.get()
+        if self.profiler:
+            self.profiler.suspend()  # Sleeping isn't frame time
+        self.sleeps += 1
+        while True:
+            if self.wake_ms is None or paused:
+                event = pygame.event.wait()
+            else:
+                left = self.wake_ms - (time.monotonic() - self._since) * 1000
+                event = pygame.event.wait(max(1, int(left)))
+            if event.type == pygame.NOEVENT:
+                self.timed_out = True
+                self._since = time.monotonic()  # A full wake_ms again if nothing restarts
+                return []
+            if event.type not in IGNORED_EVENTS:
+                return [event] + pygame.event.get()
+
+
+def draw_paused(screen, font, color):
+    """Caption the frame on screen as paused and show it"""
+    text = font.render(PAUSED_TEXT, True, color)
+    screen.blit(text, text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2)))
+    pygame.display.update()
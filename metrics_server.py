@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Prometheus metrics endpoint for cabinets running unattended
+
+With --metrics-port, a stdlib HTTP server on a daemon thread answers
+GET /metrics with the Prometheus text format: FPS and frame-time
+quantiles over the last 30 seconds, time per loop phase, live entity
+counts, sprite and text cache hit counts, garbage collections and the
+pause time they cost, spawn/collision/sound counts and the score.
+
+The game loop only feeds the exporter through the phase timer (one
+append per frame and a counter bump per event); everything else is read
+when a scrape comes in, on the server's thread.
+"""
+import gc
+import http.server
+import threading
+import time
+from collections import deque
+
+WINDOW = 900  # Frames behind FPS and the quantiles (30 seconds at 30 FPS)
+QUANTILES = (0.5, 0.9, 0.99)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsServer:
+    def __init__(self, port, host="127.0.0.1", entities=None, gauges=None, caches=None):
+        self.entities = entities  # Callable returning {entity kind: live count}
+        self.gauges = gauges  # Callable returning {name: value}, e.g. score and speed
+        self.caches = caches or {}  # name -> object with hits and misses counters
+        self.frame_times = deque(maxlen=WINDOW)  # Seconds per frame
+        self.frames = 0
+        self.frame_seconds = 0.0
+        self.phase_seconds = {}  # name -> total seconds
+        self.events = {}  # name -> count
+        self.gc_pause = 0.0
+        self._gc_started = None
+        self.started = time.time()
+        gc.callbacks.append(self._on_gc)
+
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Scrapes every few seconds would flood the console
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def frame_started(self, now_ns):
+        pass
+
+    def frame_done(self, duration_ns, phases):
+        seconds = duration_ns / 1e9
+        self.frame_times.append(seconds)
+        self.frames += 1
+        self.frame_seconds += seconds
+        totals = self.phase_seconds
+        for name, ns in phases.items():
+            totals[name] = totals.get(name, 0.0) + ns / 1e9
+
+    def note(self, name, detail=None):
+        self.events[name] = self.events.get(name, 0) + 1
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        gc.callbacks.remove(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        elif self._gc_started is not None:
+            self.gc_pause += time.perf_counter() - self._gc_started
+            self._gc_started = None
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP dino_{name} {help_text}")
+            lines.append(f"# TYPE dino_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"dino_{name}{labels} {value:.6g}")
+
+        recent = sorted(self.frame_times)
+        fps = len(recent) / sum(recent) if recent else 0.0
+        metric("fps", "gauge", "Frames per second over the recent window", [("", fps)])
+        samples = [(f'{{quantile="{q}"}}', _quantile(recent, q)) for q in QUANTILES] if recent else []
+        metric("frame_time_seconds", "summary", "Frame time, quantiles over the recent window",
+               samples + [("_sum", self.frame_seconds), ("_count", self.frames)])
+        metric("phase_seconds_total", "counter", "Time spent in each main-loop phase",
+               [(f'{{phase="{name}"}}', seconds) for name, seconds in list(self.phase_seconds.items())])
+        if self.entities:
+            metric("entities", "gauge", "Live entities by kind",
+                   [(f'{{kind="{kind}"}}', count) for kind, count in self.entities().items()])
+        metric("cache_hits_total", "counter", "Cache lookups served from the cache",
+               [(f'{{cache="{name}"}}', cache.hits) for name, cache in self.caches.items()])
+        metric("cache_misses_total", "counter", "Cache lookups that had to draw or render",
+               [(f'{{cache="{name}"}}', cache.misses) for name, cache in self.caches.items()])
+        metric("gc_collections_total", "counter", "Garbage collections by generation",
+               [(f'{{generation="{gen}"}}', stats["collections"]) for gen, stats in enumerate(gc.get_stats())])
+        metric("gc_pause_seconds_total", "counter", "Time spent in garbage collection", [("", self.gc_pause)])
+        metric("events_total", "counter", "Spawns, collisions and sounds",
+               [(f'{{event="{name}"}}', count) for name, count in list(self.events.items())])
+        if self.gauges:
+            for name, value in self.gauges().items():
+                metric(name, "gauge", name.replace("_", " ").capitalize(), [("", value)])
+        metric("uptime_seconds", "gauge", "Seconds since the exporter started", [("", time.time() - self.started)])
+        return "\n".join(lines) + "\n"
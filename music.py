@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Streaming chiptune background music
+
+A worker thread synthesizes the tune one sixteenth-note step at a time,
+using the same enveloped sine synthesis as the sound effects, and queues
+each step onto the mixer channel AudioService reserves for music with
+Channel.queue.  Only the step that is playing and the one queued behind it
+exist at any time, and the game loop never waits on synthesis: it only
+hands over the current game speed, which sets the tempo.  While the game
+is paused or over the channel is paused and the worker sleeps until the
+music is resumed.
+"""
+import threading
+
+import sound_synth
+
+BASE_BPM = 120  # Tempo at the starting game speed
+BASE_SPEED = 10
+MAX_BPM = 200
+STEPS_PER_BEAT = 4  # Sixteenth notes
+POLL_SECONDS = 0.01  # How often the worker checks for room in the queue
+LEAD_VOLUME = 0.12
+BASS_VOLUME = 0.1
+NOTE_ENVELOPE = (0.003, 0.04, 0.5, 0.02)  # Short plucky ADSR
+ROOT_FREQUENCY = 220.0  # A3; the patterns are semitones from here
+
+# Two bars of lead and one bar of bass, in semitones (None is a rest)
+LEAD = (12, None, 15, None, 17, 15, 12, None, 10, None, 12, None, 7, None, None, None,
+        12, None, 15, None, 19, 17, 15, None, 17, None, 15, None, 12, None, None, None)
+BASS = (-12, None, -12, None, -12, None, -12, None, -16, None, -16, None, -14, None, -14, None)
+
+
+def tempo_for(game_speed):
+    """Return the music tempo in BPM for a game speed"""
+    return min(MAX_BPM, BASE_BPM * game_speed / BASE_SPEED)
+
+
+def note_frequency(semitone):
+    return ROOT_FREQUENCY * 2 ** (semitone / 12)
+
+
+def synthesize_step(step, duration, rate):
+    """Return mono samples for one step of the tune"""
+    count = int(duration * rate)
+    voices = ((LEAD[step % len(LEAD)], LEAD_VOLUME), (BASS[step % len(BASS)], BASS_VOLUME))
+    numpy = sound_synth.numpy
+    mixed = numpy.zeros(count, dtype=numpy.float32) if numpy is not None else [0.0] * count
+    for semitone, volume in voices:
+        if semitone is None:
+            continue
+        samples = sound_synth.synthesize(note_frequency(semitone), duration, volume, NOTE_ENVELOPE, rate)
+        if numpy is not None:
+            mixed += samples
+        else:
+            for i, value in enumerate(samples):
+                mixed[i] += value
+    return mixed
+
+
+class MusicStream:
+    def __init__(self, service):
+        self.service = service
+        self.bpm = BASE_BPM
+        self.steps = 0
+        self.underruns = 0  # Times the channel ran dry before the next step was queued
+        self.paused = False
+        self._stop = threading.Event()
+        self._playing = threading.Event()  # Cleared while paused; the worker sleeps on it
+        self._playing.set()
+        self._thread = None
+
+    def start(self):
+        """Start streaming once the audio service has opened the mixer"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="music", daemon=True)
+            self._thread.start()
+        return self
+
+    def set_speed(self, game_speed):
+        """Follow the game speed; picked up from the next step on"""
+        self.bpm = tempo_for(game_speed)
+
+    def set_paused(self, paused):
+        """Hold the music (and stop synthesizing steps) while the game is paused or over"""
+        if paused == self.paused:
+            return  # Called every frame
+        self.paused = paused
+        if paused:
+            self._playing.clear()
+        else:
+            self._playing.set()
+        channel = self.service.music_channel
+        if channel is not None:
+            if paused:
+                channel.pause()
+            else:
+                channel.unpause()
+
+    def stop(self):
+        """Stop streaming; call before pygame.quit()"""
+        self._stop.set()
+        self._playing.set()  # Wake a paused worker so it sees the stop
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def _run(self):
+        if not self.service.wait() or self._stop.is_set():
+            return
+        channel = self.service.music_channel
+        fmt = sound_synth.mixer_format()
+        while not self._stop.is_set():
+            if self.paused:
+                self._playing.wait()  # No polling while paused
+                continue
+            if channel.get_queue() is not None:
+                # One step playing and one waiting: nothing to do yet
+                self._stop.wait(POLL_SECONDS)
+                continue
+            if self.steps and not channel.get_busy():
+                self.underruns += 1
+            duration = 60.0 / self.bpm / STEPS_PER_BEAT
+            samples = synthesize_step(self.steps, duration, fmt[0])
+            # Queue starts playing right away when the channel is idle
+            channel.queue(sound_synth.to_sound(samples, fmt))
+            self.steps += 1
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Pixelated nebula textures for the space variants' SpaceCloud
+
+A nebula is up to three overlapping discs of 3x3 blocks, each block kept
+with 70% probability and given a random alpha, plus a few white stars.
+Drawn block by block that is thousands of random() calls and draw.rect()
+calls per cloud, so with NumPy the blocks of a whole disc are generated
+as arrays (noise mask and alphas in one call each) and written to the
+surface at once; without it the original loops run.
+
+The space variants register COLORS x VARIANTS_PER_COLOR nebulae in their
+SpriteSet, which bounds the bank's memory and makes a spawn a lookup.
+"""
+import random
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # Optional: only makes drawing faster
+    numpy = None
+
+PIXEL_SIZE = 3  # Size of each "pixel" for the pixelated look
+VARIANTS_PER_COLOR = 6  # 24 nebulae, at most ~0.6 MB
+KEEP_CHANCE = 0.7  # Chance a block inside a disc is drawn
+MIN_ALPHA = 20
+STARS = 5
+WHITE = (255, 255, 255)
+
+# Nebula colors; the alpha is the most opaque a block gets
+COLORS = [
+    (255, 100, 100, 50),  # Red nebula
+    (100, 100, 255, 50),  # Blue nebula
+    (255, 100, 255, 50),  # Purple nebula
+    (100, 255, 100, 50),  # Green nebula
+]
+
+
+def _discs(width, height):
+    """Return (center_x, center_y, radius) of the cloud's puffs"""
+    centers = [(width // 4, height // 2), (width // 2, height // 3), (3 * width // 4, height // 2)]
+    return [(x, y, random.randint(height // 3, height // 2)) for x, y in centers]
+
+
+def _draw_blocks(image, color, discs):
+    """Pure-Python path: one random() and draw.rect() per block"""
+    for center_x, center_y, radius in discs:
+        for x in range(center_x - radius, center_x + radius, PIXEL_SIZE):
+            for y in range(center_y - radius, center_y + radius, PIXEL_SIZE):
+                if (x - center_x)**2 + (y - center_y)**2 <= radius**2:
+                    # Add some randomness to the nebula
+                    if random.random() > 1 - KEEP_CHANCE:
+                        alpha = random.randint(MIN_ALPHA, color[3])
+                        pygame.draw.rect(image, (color[0], color[1], color[2], alpha),
+                                         (x - center_x + radius, y - center_y + radius,
+                                          PIXEL_SIZE, PIXEL_SIZE))
+
+
+def _fill_blocks(width, height, color, discs):
+    """NumPy path: every block of a disc at once; returns the new Surface"""
+    # Seeded from `random` so build_assets.py --seed stays reproducible
+    rng = numpy.random.default_rng(random.getrandbits(64))
+    alpha = numpy.zeros((height, width), dtype=numpy.uint8)
+    for center_x, center_y, radius in discs:
+        # Block offsets from the disc center; blocks are placed relative to
+        # the disc's corner, so every disc starts at the top-left
+        offsets = numpy.arange(-radius, radius, PIXEL_SIZE)
+        inside = offsets[:, None]**2 + offsets[None, :]**2 <= radius**2
+        kept = inside & (rng.random(inside.shape) < KEEP_CHANCE)
+        alphas = rng.integers(MIN_ALPHA, color[3] + 1, inside.shape, dtype=numpy.uint8)
+        # Blow blocks up to PIXEL_SIZE squares and clip to the surface;
+        # later discs cover earlier ones, as draw.rect() would
+        kept = kept.repeat(PIXEL_SIZE, 0).repeat(PIXEL_SIZE, 1)[:height, :width]
+        alphas = alphas.repeat(PIXEL_SIZE, 0).repeat(PIXEL_SIZE, 1)[:height, :width]
+        region = alpha[:kept.shape[0], :kept.shape[1]]
+        region[kept] = alphas[kept]
+    rgba = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+    rgba[alpha > 0, :3] = color[:3]
+    rgba[..., 3] = alpha
+    return pygame.image.fromstring(rgba.tobytes(), (width, height), "RGBA")
+
+
+def draw(color, width=None, height=None):
+    """Return a new nebula Surface in one of COLORS, random-sized by default"""
+    width = width or random.randint(60, 120)
+    height = height or random.randint(30, 50)
+    discs = _discs(width, height)
+    if numpy is not None:
+        image = _fill_blocks(width, height, color, discs)
+    else:
+        image = pygame.Surface((width, height), pygame.SRCALPHA)
+        _draw_blocks(image, color, discs)
+
+    # Add some stars inside the nebula
+    for _ in range(STARS):
+        x = random.randint(0, width - PIXEL_SIZE)
+        y = random.randint(0, height - PIXEL_SIZE)
+        pygame.draw.rect(image, WHITE, (x, y, PIXEL_SIZE, PIXEL_SIZE))
+    return image
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Frame-budget driven quality levels for the effect-heavy variants
+
+A variant describes its expensive effects (trail length, glow, twinkle,
+star count, ...) as a list of settings dicts, from full detail at level 0
+to the cheapest at the end, and reads quality.settings wherever it draws
+them.  The governor listens to the phase timer: every WINDOW frames it
+averages the frames' busy time (without the wait for the frame cap and
+paced garbage collection) and steps one level down when that average is
+over DEGRADE_AT of the budget, or one level back up when it is under
+RESTORE_AT and the current level has held for a while.  The gap between
+the two thresholds, the hold time and a hold that doubles whenever a
+restored level has to be dropped again keep it from flickering between
+levels, so a slow machine keeps the game running at full speed with fewer
+effects instead of slowing the whole game down.
+"""
+import frame_profiler
+
+WINDOW = 30  # Frames averaged per decision (one second at 30 FPS)
+DEGRADE_AT = 0.9  # Fraction of the frame budget that drops a level
+RESTORE_AT = 0.6  # Fraction of the budget under which a level comes back
+HOLD_FRAMES = 150  # Frames a level is kept before trying the next better one
+MAX_HOLD_FRAMES = 2400
+SPARE_PHASES = frame_profiler.IDLE_PHASES + ("gc",)  # Not work the effects cost
+MODES = ("auto", "full", "low")
+
+
+class QualityGovernor:
+    def __init__(self, levels, fps=30):
+        self.levels = levels
+        self.budget_ms = 1000 / fps
+        self.mode = "auto"
+        self.level = 0
+        self.settings = levels[0]
+        self.changes = 0
+        self.hold = HOLD_FRAMES
+        self._held = 0  # Frames since the last change
+        self._busy = 0.0  # Busy milliseconds summed over the current window
+        self._frames = 0
+        self._restored = False  # The last change was a step back up
+
+    def set_mode(self, mode):
+        """"auto" follows the frame times; "full" and "low" pin a level"""
+        self.mode = mode
+        self._set_level(len(self.levels) - 1 if mode == "low" else 0)
+
+    def _set_level(self, level):
+        self.level = level
+        self.settings = self.levels[level]
+        self._held = 0
+
+    def frame_started(self, now_ns):
+        pass
+
+    def frame_done(self, duration_ns, phases):
+        if self.mode != "auto":
+            return
+        self._busy += sum(ns for name, ns in phases.items() if name not in SPARE_PHASES) / 1e6
+        self._frames += 1
+        if self._frames < WINDOW:
+            return
+        busy = self._busy / self._frames
+        self._busy = 0.0
+        self._frames = 0
+        self._held += WINDOW
+        if busy > self.budget_ms * DEGRADE_AT and self.level < len(self.levels) - 1:
+            if self._restored and self._held <= self.hold:
+                # The better level didn't fit after all; wait longer next time
+                self.hold = min(MAX_HOLD_FRAMES, self.hold * 2)
+            self._restored = False
+            self._set_level(self.level + 1)
+            self.changes += 1
+        elif busy < self.budget_ms * RESTORE_AT and self.level > 0 and self._held >= self.hold:
+            self._restored = True
+            self._set_level(self.level - 1)
+            self.changes += 1
+
+    def note(self, name, detail=None):
+        pass
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Exit steps collected while a variant sets up its main loop
+
+Each optional tool (autopilot, tracer, watchdog, metrics endpoint, ...)
+registers its report or cleanup right where it is created, and the QUIT
+handler runs them all in registration order before shutting pygame down,
+so adding a tool doesn't mean growing the QUIT handler of every variant.
+"""
+import sys
+
+import pygame
+
+
+class QuitSteps:
+    def __init__(self):
+        self.steps = []  # (callable, args)
+
+    def add(self, step, *args):
+        """Call step(*args) on quit; a falsy step (a switched-off tool) is skipped
+
+        so `on_quit.add(tracer and tracer.close)` works whether or not
+        the tracer exists.
+        """
+        if step:
+            self.steps.append((step, args))
+
+    def run(self):
+        """Run every step, then quit pygame and exit"""
+        for step, args in self.steps:
+            step(*args)
+        pygame.quit()
+        sys.exit()
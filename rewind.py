@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Bounded rewind history built from game_state snapshots
+
+Frames are grouped into segments: the first frame of a segment is stored
+as a full GameSnapshot (keyframe), the rest only as the entity fields that
+changed since the previous frame (deltas).  Whole segments are dropped from
+the front once the history exceeds its capacity, so memory stays bounded.
+"""
+from collections import deque
+
+from game_state import GameSnapshot
+
+REWIND_SECONDS = 10
+KEYFRAME_INTERVAL = 30  # One full snapshot per second at 30 FPS
+
+
+def _fields(frozen):
+    return dict(frozen[1])
+
+
+def _diff(previous, fields):
+    """Return the (name, value) pairs that differ from the previous frame"""
+    if previous is None:
+        return fields
+    return tuple(pair for pair in fields if previous.get(pair[0], pair) != pair[1])
+
+
+class RewindBuffer:
+    def __init__(self, seconds=REWIND_SECONDS, fps=30, keyframe_interval=KEYFRAME_INTERVAL):
+        self.capacity = seconds * fps
+        self.keyframe_interval = keyframe_interval
+        self.segments = deque()  # [keyframe, delta, delta, ...]
+        self.frames = 0
+        self._previous = None  # Field dicts of the last pushed frame
+        self._decoded = None  # Full snapshots of the tail segment while rewinding
+
+    def clear(self):
+        self.segments.clear()
+        self.frames = 0
+        self._previous = None
+        self._decoded = None
+
+    def push(self, snapshot):
+        """Record one frame"""
+        self._decoded = None
+        tail = self.segments[-1] if self.segments else None
+        if self._previous is None or len(tail) >= self.keyframe_interval:
+            self.segments.append([snapshot])
+            self._previous = self._remember(snapshot)
+        else:
+            tail.append(self._encode(snapshot))
+        self.frames += 1
+        while self.frames > self.capacity and len(self.segments) > 1:
+            self.frames -= len(self.segments.popleft())
+
+    def rewind(self):
+        """Remove and return the most recent frame as a full GameSnapshot"""
+        if not self.segments:
+            return None
+        if self._decoded is None:
+            self._decoded = self._decode(self.segments[-1])
+        snapshot = self._decoded.pop()
+        self.segments[-1].pop()
+        self._previous = None  # Recording resumes with a fresh keyframe
+        self.frames -= 1
+        if not self._decoded:
+            self.segments.pop()
+            self._decoded = None
+        return snapshot
+
+    def _remember(self, snapshot):
+        return (
+            _fields(snapshot.dino),
+            {frozen[0]: _fields(frozen) for frozen in snapshot.obstacles},
+            {frozen[0]: _fields(frozen) for frozen in snapshot.clouds},
+        )
+
+    def _encode(self, snapshot):
+        """Turn a snapshot into a delta against the previous frame"""
+        dino_fields, obstacle_fields, cloud_fields = self._previous
+        dino = (snapshot.dino[0], _diff(dino_fields, snapshot.dino[1]))
+        obstacles = tuple(
+            (entity, _diff(obstacle_fields.get(entity), fields)) for entity, fields in snapshot.obstacles)
+        clouds = tuple(
+            (entity, _diff(cloud_fields.get(entity), fields)) for entity, fields in snapshot.clouds)
+        self._previous = self._remember(snapshot)
+        return snapshot._replace(dino=dino, obstacles=obstacles, clouds=clouds)
+
+    def _decode(self, segment):
+        """Expand a keyframe and its deltas back into full snapshots"""
+        keyframe = segment[0]
+        snapshots = [keyframe]
+        dino_fields, obstacle_fields, cloud_fields = self._remember(keyframe)
+        for delta in segment[1:]:
+            dino_fields = dict(dino_fields, **dict(delta.dino[1]))
+            obstacle_fields = {
+                entity: dict(obstacle_fields.get(entity, ()), **dict(changes))
+                for entity, changes in delta.obstacles}
+            cloud_fields = {
+                entity: dict(cloud_fields.get(entity, ()), **dict(changes))
+                for entity, changes in delta.clouds}
+            snapshots.append(GameSnapshot(
+                (delta.dino[0], tuple(dino_fields.items())),
+                tuple((entity, tuple(fields.items())) for entity, fields in obstacle_fields.items()),
+                tuple((entity, tuple(fields.items())) for entity, fields in cloud_fields.items()),
+                delta.score,
+                delta.game_speed,
+                delta.high_score,
+                delta.timers,
+                delta.scenery,
+                delta.rng,
+            ))
+        return snapshots
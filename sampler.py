@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Sampling profiler for the game loop, writing folded stacks
+
+cProfile hooks every call, which inflates the many tiny calls (pixel
+rects, per-pixel alpha loops) it is supposed to measure.  StackSampler
+instead wakes up every millisecond on its own thread, reads the main
+thread's current Python stack with sys._current_frames() and counts it.
+write() emits one "outer;inner;leaf count" line per distinct stack, the
+folded format flamegraph.pl, speedscope and inferno read.
+
+A thread only runs when it gets the GIL, and CPython hands the GIL over
+every 5 ms by default, so while sampling the switch interval is lowered to
+the sample interval; it is restored by stop().
+"""
+import os
+import sys
+import threading
+import time
+
+INTERVAL = 0.001  # Seconds between samples
+
+
+def _label(code):
+    name = getattr(code, "co_qualname", code.co_name)  # Class-qualified on 3.11+
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+class StackSampler:
+    def __init__(self, interval=INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()  # Defaults to the caller's thread
+        self.counts = {}  # Root-first tuple of labels -> samples
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._labels = {}  # code object -> label, so each frame is formatted once
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def start(self):
+        if self._thread is None:
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(self.interval)
+            self.started = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None and not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+            self.elapsed = time.perf_counter() - self.started
+            sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        labels = self._labels
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _label(code)
+                stack.append(label)
+                frame = frame.f_back
+            stack = tuple(reversed(stack))
+            self.counts[stack] = self.counts.get(stack, 0) + 1
+            self.samples += 1
+
+    def write(self, path):
+        """Stop sampling and write the folded stacks, heaviest first"""
+        self.stop()
+        with open(path, "w", encoding="utf-8") as out:
+            for stack, count in sorted(self.counts.items(), key=lambda item: -item[1]):
+                out.write(f"{';'.join(stack)} {count}\n")
+        rate = self.samples / self.elapsed if self.elapsed else 0
+        print(f"Profile written to {path}: {self.samples} samples over {self.elapsed:.1f} s "
+              f"({rate:.0f}/s), {len(self.counts)} distinct stacks")
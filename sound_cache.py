@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Content-addressed on-disk cache for synthesized sound effects
+
+Each effect is stored as a WAV file whose name includes a hash of its
+synthesis parameters and the mixer format, so a cached file can be used
+as-is: its data chunk is memory-mapped and handed straight to
+pygame.mixer.Sound(buffer=...).  Files are written atomically (temp file +
+os.replace) so concurrently starting kiosks never read a partial file.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import pygame
+
+import cache_paths
+import sound_synth
+
+CACHE_VERSION = 1  # Bump when synthesis changes in a way params don't capture
+HEADER_SIZE = 44  # RIFF header + fmt chunk + data chunk header
+
+
+def sound_key(name, params, fmt):
+    """Return the content hash identifying one synthesized effect"""
+    blob = json.dumps({"name": name, "params": params, "format": list(fmt), "version": CACHE_VERSION},
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:20]
+
+
+def _wav_header(fmt, data_size):
+    rate, sample_format, channels = fmt
+    bits = abs(sample_format)
+    tag = 3 if sample_format == 32 else 1  # IEEE float or PCM
+    block = channels * bits // 8
+    return (b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, tag, channels, rate, rate * block, block, bits)
+            + b"data" + struct.pack("<I", data_size))
+
+
+def _load(path, fmt):
+    """Return a Sound from a cached WAV, or None if missing or stale"""
+    try:
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if len(data) <= HEADER_SIZE:
+                    return None
+                size = len(data) - HEADER_SIZE
+                if data[:HEADER_SIZE] != _wav_header(fmt, size):
+                    return None
+                view = memoryview(data)
+                try:
+                    # Sound copies the buffer, so the mapping can close afterwards
+                    return pygame.mixer.Sound(buffer=view[HEADER_SIZE:])
+                finally:
+                    view.release()
+    except (OSError, ValueError):
+        return None
+
+
+def _store(path, sound, fmt):
+    """Write a Sound to the cache atomically; failures only cost the cache"""
+    raw = sound.get_raw()
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as out:
+                out.write(_wav_header(fmt, len(raw)))
+                out.write(raw)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+def load_sound(name, params, directory=None):
+    """Return the effect from the cache, synthesizing and storing it on a miss"""
+    fmt = sound_synth.mixer_format()
+    path = os.path.join(directory or os.path.join(cache_paths.cache_dir(), "sounds"),
+                        f"{name}-{sound_key(name, params, fmt)}.wav")
+    sound = _load(path, fmt)
+    if sound is None:
+        sound = sound_synth.make_sound(**params)
+        _store(path, sound, fmt)
+    return sound
+
+
+def load_sounds(effects=sound_synth.EFFECTS, directory=None):
+    """Return a dict of effect name -> Sound, using the cache where possible"""
+    return {name: load_sound(name, params, directory) for name, params in effects.items()}
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Procedural sound effects synthesized in the mixer's own sample format
+
+pygame.mixer.Sound(buffer=...) interprets raw bytes in whatever format the
+mixer was opened with (normally signed 16-bit stereo), so samples are built
+for exactly that format as reported by pygame.mixer.get_init().  NumPy and
+pygame.sndarray are used when available; otherwise a slower pure-Python
+path produces the same samples.
+"""
+import math
+from array import array
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # Optional: only makes synthesis faster
+    numpy = None
+
+# Effect parameters.  `envelope` is (attack, decay, sustain level, release)
+# in seconds, with the sustain phase filling the rest of the duration.
+EFFECTS = {
+    "jump": {"frequency": 800, "duration": 0.2, "volume": 0.5, "envelope": (0.005, 0.0, 1.0, 0.02)},
+    "collision": {"frequency": 200, "duration": 0.3, "volume": 0.5, "envelope": (0.005, 0.295, 0.0, 0.0)},
+    "point": {"frequency": 1200, "duration": 0.1, "volume": 0.5, "envelope": (0.005, 0.0, 1.0, 0.02)},
+}
+
+# Array typecodes / NumPy dtypes for each pygame mixer format
+_TYPECODES = {8: "B", -8: "b", 16: "H", -16: "h", 32: "f"}
+_DTYPES = {8: "uint8", -8: "int8", 16: "uint16", -16: "int16", 32: "float32"}
+
+
+def mixer_format():
+    """Return (sample rate, format, channels) of the open mixer"""
+    init = pygame.mixer.get_init()
+    if init is None:
+        raise pygame.error("mixer not initialized")
+    return init
+
+
+def _scale(fmt):
+    """Return (amplitude, offset) mapping [-1, 1] onto the sample format"""
+    if fmt == 32:
+        return 1.0, 0.0
+    bits = abs(fmt)
+    full = (1 << (bits - 1)) - 1
+    offset = 0.0 if fmt < 0 else float(1 << (bits - 1))
+    return float(full), offset
+
+
+def envelope_points(count, rate, attack, decay, sustain, release):
+    """Return the (start, end, from level, to level) segments of an ADSR envelope"""
+    a = min(count, int(attack * rate))
+    d = min(count - a, int(decay * rate))
+    r = min(count - a - d, int(release * rate))
+    s = count - a - d - r
+    return [
+        (0, a, 0.0, 1.0),
+        (a, a + d, 1.0, sustain),
+        (a + d, a + d + s, sustain, sustain),
+        (a + d + s, count, sustain, 0.0),
+    ]
+
+
+def synthesize(frequency, duration, volume=0.5, envelope=(0.0, 0.0, 1.0, 0.0), rate=44100):
+    """Return mono samples in [-1, 1] for an enveloped sine tone"""
+    count = int(duration * rate)
+    segments = envelope_points(count, rate, *envelope)
+    if numpy is not None:
+        t = numpy.arange(count, dtype=numpy.float32) / rate
+        wave = numpy.sin(numpy.float32(2 * math.pi * frequency) * t)
+        gain = numpy.empty(count, dtype=numpy.float32)
+        for start, end, level_from, level_to in segments:
+            if end > start:
+                gain[start:end] = numpy.linspace(level_from, level_to, end - start, endpoint=False)
+        return wave * gain * numpy.float32(volume)
+
+    samples = []
+    step = 2 * math.pi * frequency / rate
+    for start, end, level_from, level_to in segments:
+        span = end - start
+        for i in range(start, end):
+            level = level_from + (level_to - level_from) * (i - start) / span
+            samples.append(math.sin(step * i) * level * volume)
+    return samples
+
+
+def to_sound(samples, fmt=None):
+    """Build a pygame Sound from mono [-1, 1] samples in the mixer format"""
+    rate, fmt, channels = fmt or mixer_format()
+    amplitude, offset = _scale(fmt)
+    if numpy is not None:
+        data = numpy.asarray(samples, dtype=numpy.float32) * amplitude + offset
+        data = data.astype(_DTYPES[fmt])
+        if channels > 1:
+            data = numpy.repeat(data[:, None], channels, axis=1)
+        return pygame.sndarray.make_sound(numpy.ascontiguousarray(data))
+
+    cast = float if fmt == 32 else int
+    data = array(_TYPECODES[fmt])
+    for value in samples:
+        sample = cast(value * amplitude + offset)
+        for _ in range(channels):
+            data.append(sample)
+    return pygame.mixer.Sound(buffer=data.tobytes())
+
+
+def make_sound(frequency, duration, volume=0.5, envelope=(0.0, 0.0, 1.0, 0.0)):
+    """Synthesize one effect for the open mixer"""
+    rate, fmt, channels = mixer_format()
+    samples = synthesize(frequency, duration, volume, envelope, rate)
+    return to_sound(samples, (rate, fmt, channels))
+
+
+def create_sounds(effects=EFFECTS):
+    """Return a dict of effect name -> Sound for the open mixer"""
+    return {name: make_sound(**params) for name, params in effects.items()}
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Sprite cache and compiled sprite atlases
+
+Each variant registers the sprites it draws with a SpriteSet: a key, a
+function returning the frames, and how many random variants to keep for
+sprites whose drawing is randomized.  A sprite is drawn once on first use
+and shared by every later spawn; the title screen draws them all up front
+on a worker thread (see title_screen.py).
+
+build_assets.py renders a whole SpriteSet ahead of time into one atlas
+file: a JSON index followed by the raw RGBA pixels of a packed sheet.
+load_atlas() memory-maps that file, wraps the pixels in a Surface without
+copying them and fills the cache with subsurfaces, so a cold start reads
+one file instead of running any drawing code.  The index records a hash of
+the variant's source, and a stale atlas is ignored.
+"""
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import tempfile
+
+import pygame
+
+ATLAS_MAGIC = b"DINOATL1"
+ATLAS_VERSION = 1  # Bump when the file layout changes
+ATLAS_WIDTH = 1024
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+RANDOM_VARIANTS = 12  # Variants kept of each sprite whose drawing is randomized
+
+
+def _pack(sizes, width):
+    """Shelf-pack (w, h) sizes into rows; return boxes and the sheet height"""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    boxes = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x, y, shelf = 0, y + shelf, 0
+        boxes[i] = (x, y, w, h)
+        x += w
+        shelf = max(shelf, h)
+    return boxes, y + shelf
+
+
+class SpriteSet:
+    def __init__(self, source, *depends):
+        self.source = source  # Module whose drawing code an atlas must match
+        self.depends = depends  # Other modules the drawing code calls into
+        self.name = os.path.splitext(os.path.basename(source))[0]
+        self.builders = {}  # key -> (build, variants)
+        self.cache = {}  # key -> list of frame tuples, one per variant
+        self.hits = 0  # get() calls served from the cache
+        self.misses = 0  # get() calls that had to draw
+        self.atlas_loaded = False
+        self._atlas = None  # Keeps the mapping alive while subsurfaces use it
+
+    def add(self, key, build, variants=1):
+        """Register a sprite; build() returns its frames as a sequence of Surfaces"""
+        self.builders[key] = (build, variants)
+
+    def get(self, key):
+        """Return the frames of a sprite, drawing it on first use
+
+        Randomized sprites draw a new variant per call until all of them
+        exist, then hand out one of those at random.
+        """
+        build, variants = self.builders[key]
+        built = self.cache.setdefault(key, [])
+        if len(built) < variants:
+            self.misses += 1
+            frames = tuple(build())
+            built.append(frames)
+            return frames
+        self.hits += 1
+        if variants == 1:
+            return built[0]
+        return random.choice(built)
+
+    def missing(self):
+        """Return how many variants are still to be drawn"""
+        return sum(max(0, variants - len(self.cache.get(key, ())))
+                   for key, (_, variants) in self.builders.items())
+
+    def build_all(self):
+        """Draw every missing variant of every sprite, yielding the key after each one"""
+        for key, (build, variants) in list(self.builders.items()):
+            built = self.cache.setdefault(key, [])
+            while len(built) < variants:
+                built.append(tuple(build()))
+                yield key
+
+    def fingerprint(self):
+        """Return the hash tying an atlas to the current drawing code"""
+        digest = hashlib.sha256(str(ATLAS_VERSION).encode("ascii"))
+        for path in (self.source,) + self.depends:
+            with open(path, "rb") as handle:
+                digest.update(handle.read())
+        return digest.hexdigest()[:20]
+
+    def atlas_path(self, directory=None):
+        return os.path.join(directory or ASSET_DIR, f"{self.name}.atlas")
+
+    def save_atlas(self, path=None):
+        """Draw every sprite and pack all frames into one atlas file; return its path"""
+        path = path or self.atlas_path()
+        for _ in self.build_all():
+            pass
+        frames = [(key, variant, surface)
+                  for key in self.builders
+                  for variant, surfaces in enumerate(self.cache[key])
+                  for surface in surfaces]
+        boxes, height = _pack([surface.get_size() for _, _, surface in frames], ATLAS_WIDTH)
+
+        sheet = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+        sprites = {key: [[] for _ in self.cache[key]] for key in self.builders}
+        for (key, variant, surface), box in zip(frames, boxes):
+            # Go through RGBA bytes so opaque sources copy exactly too; MAX
+            # against the transparent sheet copies instead of blending
+            rgba = pygame.image.fromstring(pygame.image.tostring(surface, "RGBA"), surface.get_size(), "RGBA")
+            sheet.blit(rgba, box[:2], special_flags=pygame.BLEND_RGBA_MAX)
+            sprites[key][variant].append(box)
+
+        index = json.dumps({
+            "fingerprint": self.fingerprint(),
+            "size": list(sheet.get_size()),
+            "sprites": sprites,
+        }).encode("utf-8")
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as out:
+                out.write(ATLAS_MAGIC + struct.pack("<I", len(index)) + index)
+                out.write(pygame.image.tostring(sheet, "RGBA"))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return path
+
+    def load_atlas(self, path=None):
+        """Fill the cache from a compiled atlas; return False if missing or stale"""
+        path = path or self.atlas_path()
+        try:
+            with open(path, "rb") as handle:
+                # Copy-on-write, so a sprite drawn on at runtime never touches the file
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return False
+        header = len(ATLAS_MAGIC) + 4
+        try:
+            if data[:len(ATLAS_MAGIC)] != ATLAS_MAGIC:
+                raise ValueError("not an atlas")
+            (size,) = struct.unpack_from("<I", data, len(ATLAS_MAGIC))
+            index = json.loads(data[header:header + size].decode("utf-8"))
+            width, height = index["size"]
+            start = header + size
+            if index["fingerprint"] != self.fingerprint() or len(data) != start + width * height * 4:
+                raise ValueError("stale atlas")
+        except (ValueError, KeyError, struct.error):
+            data.close()
+            return False
+
+        sheet = pygame.image.frombuffer(memoryview(data)[start:], (width, height), "RGBA")
+        for key, variants in index["sprites"].items():
+            if key in self.builders:
+                self.cache[key] = [tuple(sheet.subsurface(box) for box in frames) for frames in variants]
+        self._atlas = (data, sheet)
+        self.atlas_loaded = True
+        return True
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Startup profiler: where the time goes before the first frame
+
+Each variant creates one StartupProfiler at import and wraps the steps of
+its start() path (pygame init, font lookup, sprite generation, ...) in
+phase().  The audio thread adds its own phases as they finish, so
+report() shows the background work next to the time to first frame.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, seconds, background) in completion order
+        self.first_frame = None  # Seconds from creation to the first display update
+        self.reported = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name, background=False):
+        """Time the enclosed block as one startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, background)
+
+    def add(self, name, seconds, background=False):
+        with self._lock:
+            self.phases.append((name, seconds, background))
+
+    def frame_shown(self):
+        """Call after every display update; only the first one is recorded"""
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.started
+
+    @property
+    def pending(self):
+        """True once the first frame is up and the report hasn't been printed"""
+        return self.first_frame is not None and not self.reported
+
+    def report(self):
+        """Print the startup phases and time to first frame"""
+        self.reported = True
+        # Phases that ran more than once (e.g. sprite generation) are summed
+        totals = {}
+        with self._lock:
+            for name, seconds, background in self.phases:
+                totals[name, background] = totals.get((name, background), 0.0) + seconds
+        print("Startup profile:")
+        for (name, background), seconds in totals.items():
+            where = " (background)" if background else ""
+            print(f"  {name:<20} {seconds * 1000:8.1f} ms{where}")
+        if self.first_frame is not None:
+            print(f"  {'first frame':<20} {self.first_frame * 1000:8.1f} ms after import")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Title screen that warms the sprite cache before play
+
+Obstacles, clouds and glow frames are drawn the first time a variant asks
+for them (see sprites.py), which used to happen mid-run on the first
+spawn of each.  show() puts up a title screen while a Warmup thread draws
+every sprite the variant registered, with a progress bar, and only lets
+play begin once the cache is full.  With a current atlas the cache is full
+already and the screen just waits for the player.
+"""
+import threading
+import time
+
+import pygame
+
+import fonts
+
+FPS = 30
+BAR_WIDTH = 300
+BAR_HEIGHT = 12
+START_KEYS = (pygame.K_SPACE, pygame.K_UP)
+
+
+class Warmup:
+    """Draws every missing sprite of a SpriteSet on a worker thread"""
+
+    def __init__(self, sprite_set, profiler=None):
+        self.sprite_set = sprite_set
+        self.profiler = profiler
+        self.total = sprite_set.missing()
+        self.drawn = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and self.total:
+            self._thread = threading.Thread(target=self._run, name="sprite-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def progress(self):
+        """Fraction of the missing variants drawn so far"""
+        return self.drawn / self.total if self.total else 1.0
+
+    def done(self):
+        """True once every sprite is cached (or drawing failed)"""
+        return self.drawn >= self.total or self.error is not None
+
+    def stop(self):
+        """Abandon the warm-up; call before pygame.quit()"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            for _ in self.sprite_set.build_all():
+                # The main thread only reads the cache once `drawn` reaches `total`
+                self.drawn += 1
+                if self._stop.is_set():
+                    return
+        except Exception as e:
+            # Whatever is left gets drawn on first use instead
+            self.error = e
+            print(f"Could not pre-draw sprites: {e}")
+        if self.profiler:
+            self.profiler.add("sprite warm-up", time.perf_counter() - started, background=True)
+
+
+def show(screen, clock, font, sprite_set, foreground, background, autostart=False, profiler=None):
+    """Run the title screen until the cache is warm and the player starts
+
+    `background` is a color or a Surface.  Pressing SPACE/UP during the
+    warm-up starts as soon as it finishes; with autostart (attract mode)
+    play starts without a key.  Returns False if the window was closed.
+    """
+    warmup = Warmup(sprite_set, profiler).start()
+    title_font = fonts.load("Arial", 40, bold=True)
+    title = pygame.display.get_caption()[0]
+    width, height = screen.get_size()
+    start_requested = autostart
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                warmup.stop()
+                return False
+            if event.type == pygame.KEYDOWN and event.key in START_KEYS:
+                start_requested = True
+        if start_requested and warmup.done():
+            return True
+
+        if isinstance(background, pygame.Surface):
+            screen.blit(background, (0, 0))
+        else:
+            screen.fill(background)
+        title_text = title_font.render(title, True, foreground)
+        screen.blit(title_text, title_text.get_rect(center=(width // 2, height // 3)))
+
+        if warmup.done():
+            prompt = "Press SPACE to start"
+        else:
+            # Progress bar: outline plus the drawn fraction
+            bar = pygame.Rect(0, 0, BAR_WIDTH, BAR_HEIGHT)
+            bar.center = (width // 2, height // 2)
+            pygame.draw.rect(screen, foreground, bar, 1)
+            filled = bar.inflate(-4, -4)
+            filled.width = int(filled.width * warmup.progress)
+            pygame.draw.rect(screen, foreground, filled)
+            prompt = f"Preparing sprites... {warmup.progress:.0%}"
+        prompt_text = font.render(prompt, True, foreground)
+        screen.blit(prompt_text, prompt_text.get_rect(center=(width // 2, height // 2 + 30)))
+
+        pygame.display.update()
+        if profiler:
+            profiler.frame_shown()
+        clock.tick(FPS)
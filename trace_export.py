@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Chrome trace-event export of frame phases and game events
+
+With --trace, every frame and loop phase timed by frame_profiler becomes a
+complete ("X") event, and spawns, collisions and sounds become instant
+("i") events, in the JSON array format that chrome://tracing and Perfetto
+open directly.  The main thread only puts small tuples on a bounded queue;
+a writer thread formats and streams them to disk.  If the queue is full
+the event is dropped and counted rather than blocking the frame.
+"""
+import json
+import os
+import queue
+import threading
+import time
+
+QUEUE_SIZE = 20000  # Events buffered before new ones are dropped
+BATCH = 512  # Events written per file write
+
+
+class TraceWriter:
+    def __init__(self, path, queue_size=QUEUE_SIZE):
+        self.path = path
+        self.written = 0
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()  # Events come from the game loop
+        self.origin = time.perf_counter_ns()
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def span(self, name, start_ns, duration_ns, category="phase"):
+        """Record a complete event from perf_counter_ns timestamps"""
+        self._put(("X", name, category, start_ns, duration_ns, None))
+
+    def instant(self, name, detail=None, category="game"):
+        """Record a point event such as a spawn; `detail` shows up in args"""
+        self._put(("i", name, category, time.perf_counter_ns(), 0, detail))
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush everything queued, finish the file and print a summary"""
+        self._queue.put(None)
+        self._thread.join()
+        print(f"Trace written to {self.path}: {self.written} events, {self.dropped} dropped")
+
+    def _format(self, event):
+        phase, name, category, start, duration, detail = event
+        record = {"name": name, "cat": category, "ph": phase, "pid": self.pid, "tid": self.tid,
+                  "ts": (start - self.origin) / 1000}
+        if phase == "X":
+            record["dur"] = duration / 1000
+        else:
+            record["s"] = "t"  # Thread-scoped instant
+        if detail is not None:
+            record["args"] = {"detail": detail}
+        return json.dumps(record)
+
+    def _run(self):
+        with open(self.path, "w", encoding="utf-8") as out:
+            # Name the track after the game loop thread
+            out.write("[\n" + json.dumps({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": self.tid,
+                                          "args": {"name": "game loop"}}))
+            done = False
+            while not done:
+                batch = [self._queue.get()]
+                while len(batch) < BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    batch.pop()
+                    done = True
+                if batch:
+                    out.write("".join(",\n" + self._format(event) for event in batch))
+                    self.written += len(batch)
+            out.write("\n]\n")
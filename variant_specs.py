@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""The game variants and the geometry and spawn rules the tools rely on
+
+fairness_check.py replays each variant's spawn rules and hitboxes from
+here, and build_assets.py and benchmark.py take their list of variant
+modules from VARIANTS, so adding a variant or changing an obstacle size
+means updating this one module.
+"""
+SCREEN_WIDTH = 800
+GROUND_HEIGHT = 350
+DINO_X = 80
+
+# Geometry and spawn rules of each variant, mirroring its dino_game_*.py module;
+# the keys are also the module names the tools import
+_CLASSIC = dict(
+    dino=(44, 48), duck=(54, 28),
+    start_speed=10, speed_step=0.1, max_speed=None, spawn="fixed",
+    ground_sizes=[(20, 40), (30, 60), (40, 80)], flyer_size=(40, 30),
+    ground_speed=None, flyer_speed=None, drift=False,
+)
+_TREX = dict(_CLASSIC, dino=(50, 60), duck=(60, 40))
+
+VARIANTS = {
+    "dino_game": _CLASSIC,
+    "dino_game_fixed": _CLASSIC,
+    "dino_game_with_sound": _CLASSIC,
+    "dino_game_pixelated": _TREX,
+    "dino_game_space": dict(
+        _TREX, ground_sizes=[(25, 25), (40, 40), (60, 60)], flyer_size=(50, 25),
+    ),
+    "dino_game_space_enhanced": dict(
+        _TREX, ground_sizes=[(25, 25), (40, 40), (60, 60)], flyer_size=(50, 25),
+        start_speed=15, speed_step=0.2, max_speed=30, spawn="ramped",
+        ground_speed=[(1.3, 1.7), (1.1, 1.4), (0.9, 1.2)], flyer_speed=(1.2, 1.8),
+        drift=True,
+    ),
+    "dino_game_futuristic": dict(
+        _CLASSIC, dino=(60, 70), duck=(70, 50),
+        ground_sizes=[(20, 40), (40, 60), (50, 80)], flyer_size=(50, 30),
+    ),
+}
+
+FLYER_HEIGHTS = [GROUND_HEIGHT - 50, GROUND_HEIGHT - 100, GROUND_HEIGHT - 150]
+DRIFT_INTERVAL = 30  # AlienShip.direction_change_timer period
+
+
+def select(name):
+    """Return the variant modules a --variant option names ("all" or one module)"""
+    if name == "all":
+        return list(VARIANTS)
+    if name in VARIANTS:
+        return [name]
+    raise ValueError(f"unknown variant {name!r}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Slow-frame watchdog writing evidence to a rotating log
+
+The phase timer tells the watchdog when each frame starts and hands it
+the frame's phase timings when it ends.  A monitor thread polls the
+running frame, and once it is over budget it grabs the main thread's
+stack right then, while the stall is still happening.  When the slow
+frame finishes, one log entry records its duration, phase timings, live
+entity counts, the spawns and sounds it triggered, the garbage
+collections that ran inside it and the captured stack, so a stutter can be
+pinned on a spawn, the GC or audio.
+
+Entries go to a RotatingFileHandler, so a cabinet left running for weeks
+keeps only the last few megabytes.
+"""
+import gc
+import logging
+import logging.handlers
+import sys
+import threading
+import time
+import traceback
+
+BUDGET_MS = 40  # A frame this long is slow (33.3 ms is the 30 FPS budget)
+LOG_PATH = "slow_frames.log"
+LOG_BYTES = 1024 * 1024  # Per file before rotating
+LOG_BACKUPS = 3
+POLL_SECONDS = 0.005  # Monitor resolution
+
+
+class FrameWatchdog:
+    def __init__(self, budget_ms=BUDGET_MS, path=LOG_PATH, counts=None):
+        self.budget_ns = int(budget_ms * 1e6)
+        self.counts = counts  # Callable returning {entity kind: live count}
+        self.slow_frames = 0
+        self.logger = logging.getLogger("dino.watchdog")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_BYTES, backupCount=LOG_BACKUPS)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.logger.addHandler(self.handler)
+
+        self._main = threading.get_ident()  # The game loop's thread
+        self._frame = 0
+        self._started = None  # perf_counter_ns() at the start of the running frame
+        self._stack = None  # (frame, ms into the frame, formatted stack)
+        self._events = []
+        self._gc = [0, 0]  # Collections and nanoseconds spent in them this frame
+        self._gc_started = None
+        gc.callbacks.append(self._on_gc)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._monitor, name="frame-watchdog", daemon=True)
+        self._thread.start()
+
+    def frame_started(self, now_ns):
+        self._frame += 1
+        self._events = []
+        self._gc = [0, 0]
+        self._started = now_ns
+
+    def note(self, name, detail=None):
+        """Remember a game event (spawn, collision, sound) of the running frame"""
+        self._events.append(f"{name} {detail}" if detail else name)
+
+    def frame_done(self, duration_ns, phases):
+        """Log the frame that just ended if it was over budget"""
+        self._started = None  # Until the next frame starts; the loop may sleep
+        if duration_ns <= self.budget_ns:
+            return
+        self.slow_frames += 1
+        lines = [f"slow frame {self._frame}: {duration_ns / 1e6:.1f} ms (budget {self.budget_ns / 1e6:.1f} ms)"]
+        lines.append("  phases: " + ", ".join(f"{name} {ns / 1e6:.1f}" for name, ns in phases.items()))
+        if self.counts:
+            lines.append("  entities: " + ", ".join(f"{name} {count}" for name, count in self.counts().items()))
+        lines.append("  events: " + (", ".join(self._events) or "none"))
+        collections, gc_ns = self._gc
+        lines.append(f"  gc: {collections} collections, {gc_ns / 1e6:.1f} ms")
+        stack = self._stack
+        if stack and stack[0] == self._frame:
+            lines.append(f"  stack at {stack[1]:.1f} ms:")
+            lines.extend("    " + line for line in stack[2].rstrip().splitlines())
+        else:
+            lines.append("  stack: not captured (the frame ended before the next poll)")
+        self.logger.info("\n".join(lines))
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+        gc.callbacks.remove(self._on_gc)
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+        if self.slow_frames:
+            print(f"Watchdog: {self.slow_frames} slow frames logged to {self.handler.baseFilename}")
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_started = time.perf_counter_ns()
+        elif self._gc_started is not None:
+            self._gc[0] += 1
+            self._gc[1] += time.perf_counter_ns() - self._gc_started
+            self._gc_started = None
+
+    def _monitor(self):
+        while not self._stop.wait(POLL_SECONDS):
+            frame, started = self._frame, self._started
+            if started is None or (self._stack and self._stack[0] == frame):
+                continue
+            elapsed = time.perf_counter_ns() - started
+            if elapsed > self.budget_ns:
+                main = sys._current_frames().get(self._main)
+                if main is not None and frame == self._frame:
+                    self._stack = (frame, elapsed / 1e6, "".join(traceback.format_stack(main)))